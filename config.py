@@ -15,3 +15,172 @@ FIELD_MAP = {
     "Links": "href",
     "Images": "src"
 }
+
+# Crawl + scrape in one pass (each page downloaded/rendered once)
+FUSED_CRAWL = os.getenv("FUSED_CRAWL", "true").lower() == "true"
+
+# Concurrent fetch engine (static scraping + crawling)
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", 16))
+PER_HOST_CONCURRENCY = int(os.getenv("PER_HOST_CONCURRENCY", 4))
+
+# Shared HTTP client (keep-alive pool used by API, static scraper and crawler)
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 10))   # hosts kept warm
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", max(FETCH_CONCURRENCY, 10)))  # sockets per host
+USER_AGENT = os.getenv(
+    "USER_AGENT",
+    "Mozilla/5.0 (compatible; universal_scraper/1.0)"
+)
+# Product token matched against robots.txt User-agent lines (not the full UA string)
+ROBOTS_USER_AGENT = os.getenv("ROBOTS_USER_AGENT", "universal_scraper")
+
+# Per-host politeness: token bucket per host, AIMD rate adjustment.
+# Also enforces robots.txt Crawl-delay; disabling it removes all pacing.
+POLITENESS_ENABLED = os.getenv("POLITENESS_ENABLED", "true").lower() == "true"
+HOST_RATE_INITIAL = float(os.getenv("HOST_RATE_INITIAL", 5))      # requests/second per host
+HOST_RATE_MIN = float(os.getenv("HOST_RATE_MIN", 0.2))
+HOST_RATE_MAX = float(os.getenv("HOST_RATE_MAX", 20))
+HOST_RATE_STEP = float(os.getenv("HOST_RATE_STEP", 0.25))         # additive increase per fast response
+HOST_BACKOFF_FACTOR = float(os.getenv("HOST_BACKOFF_FACTOR", 0.5))  # multiplicative decrease on 429/503
+HOST_BURST = float(os.getenv("HOST_BURST", 5))
+HOST_LATENCY_TARGET = float(os.getenv("HOST_LATENCY_TARGET", 2.0))  # seconds; slower → ease off
+HOST_MAX_RETRY_AFTER = float(os.getenv("HOST_MAX_RETRY_AFTER", 300))
+
+# Fetch policy: retries with jittered backoff, hedged requests, circuit breakers
+FETCH_RETRIES = int(os.getenv("FETCH_RETRIES", 2))                    # extra attempts per request
+RETRY_BACKOFF_BASE = float(os.getenv("RETRY_BACKOFF_BASE", 0.5))      # seconds, doubled per attempt
+RETRY_BACKOFF_MAX = float(os.getenv("RETRY_BACKOFF_MAX", 10))
+RETRY_STATUSES = [
+    int(s) for s in os.getenv("RETRY_STATUSES", "429,500,502,503,504").split(",") if s.strip()
+]
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", 95))   # duplicate a request slower than pXX
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", 20))   # latencies seen before hedging a host
+HEDGE_WORKERS = int(os.getenv("HEDGE_WORKERS", 32))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))   # consecutive failures
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", 30))        # open → half-open
+
+# Persistent Playwright pool (dynamic scraping + browser crawling)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 2))           # parallel Chromium workers (1 context/page each)
+BROWSER_RECYCLE_AFTER = int(os.getenv("BROWSER_RECYCLE_AFTER", 50))  # navigations per context
+
+# Dynamic DOM extraction: "batched" (one page.evaluate) or "per_element" (legacy RPC walk)
+DYNAMIC_EXTRACTION = os.getenv("DYNAMIC_EXTRACTION", "batched").lower()
+DOM_CHUNK_SIZE = int(os.getenv("DOM_CHUNK_SIZE", 5000))   # elements per evaluate, 0 = no chunking
+
+# Browser request blocking (empty value disables that rule)
+# Stylesheets are NOT blocked by default: innerText depends on CSS visibility.
+BLOCK_RESOURCE_TYPES = [
+    t.strip().lower()
+    for t in os.getenv("BLOCK_RESOURCE_TYPES", "image,media,font").split(",")
+    if t.strip()
+]
+BLOCK_DOMAINS = [
+    d.strip().lower()
+    for d in os.getenv(
+        "BLOCK_DOMAINS",
+        "google-analytics.com,googletagmanager.com,doubleclick.net,"
+        "googlesyndication.com,facebook.net,connect.facebook.net,hotjar.com,"
+        "segment.io,segment.com,mixpanel.com,clarity.ms,adservice.google.com"
+    ).split(",")
+    if d.strip()
+]
+
+# Page settle detection: "adaptive" (scroll until stable + quiet window) or "fixed" (legacy timers)
+SETTLE_MODE = os.getenv("SETTLE_MODE", "adaptive").lower()
+SETTLE_QUIET_MS = int(os.getenv("SETTLE_QUIET_MS", 500))     # no mutations / requests for this long
+SETTLE_MAX_MS = int(os.getenv("SETTLE_MAX_MS", 10000))       # hard cap per page
+SETTLE_POLL_MS = int(os.getenv("SETTLE_POLL_MS", 100))
+
+# API discovery
+API_PROBE_TIMEOUT = int(os.getenv("API_PROBE_TIMEOUT", REQUEST_TIMEOUT))
+API_DISCOVERY_WORKERS = int(os.getenv("API_DISCOVERY_WORKERS", 12))
+API_CACHE_TTL = int(os.getenv("API_CACHE_TTL", 900))               # seconds, endpoint found
+API_NEGATIVE_CACHE_TTL = int(os.getenv("API_NEGATIVE_CACHE_TTL", 300))  # seconds, no API
+API_PAGE_CONCURRENCY = int(os.getenv("API_PAGE_CONCURRENCY", 4))    # API pages fetched in parallel
+API_MAX_PAGES = int(os.getenv("API_MAX_PAGES", 1000))
+
+# Local caches (render strategy, HTTP responses, ...)
+CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+
+# Per-host STATIC/DYNAMIC decision reuse
+RENDER_CACHE_TTL = int(os.getenv("RENDER_CACHE_TTL", 7 * 24 * 3600))   # seconds
+RENDER_REFRESH = os.getenv("RENDER_REFRESH", "false").lower() == "true"  # force re-evaluation
+
+# Opt-in on-disk HTTP cache with ETag / Last-Modified revalidation
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "false").lower() == "true"
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(CACHE_DIR, "http"))
+HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", 512))    # LRU-evicted beyond this
+
+# Crawl frontier
+CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", 10))                  # link hops from start URL
+CRAWL_MAX_QUERY_VARIANTS = int(os.getenv("CRAWL_MAX_QUERY_VARIANTS", 25))  # distinct queries per path
+CRAWL_MAX_URL_LENGTH = int(os.getenv("CRAWL_MAX_URL_LENGTH", 2048))
+CRAWL_BLOOM_CAPACITY = int(os.getenv("CRAWL_BLOOM_CAPACITY", 0))   # >0: Bloom filter seen-set sized for N URLs
+TRACKING_PARAMS = [
+    p.strip().lower()
+    for p in os.getenv(
+        "TRACKING_PARAMS",
+        "utm_*,gclid,fbclid,msclkid,mc_cid,mc_eid,_ga,_gl,yclid,igshid,ref_src"
+    ).split(",")
+    if p.strip()
+]
+
+# URL discovery: "links" (follow links from the start URL) or
+# "sitemap" (also honor robots.txt and seed the frontier from its sitemaps)
+CRAWL_DISCOVERY = os.getenv("CRAWL_DISCOVERY", "links").lower()
+SITEMAP_MAX_URLS = int(os.getenv("SITEMAP_MAX_URLS", 50000))         # sitemap entries read per crawl
+SITEMAP_INCREMENTAL = os.getenv("SITEMAP_INCREMENTAL", "true").lower() == "true"   # skip unchanged lastmod
+SITEMAP_DB = os.getenv("SITEMAP_DB", os.path.join(CACHE_DIR, "sitemap_lastmod.sqlite"))
+
+# Crawl checkpointing (SQLite) for --resume
+CRAWL_STATE_ENABLED = os.getenv("CRAWL_STATE_ENABLED", "true").lower() == "true"
+CRAWL_STATE_DIR = os.getenv("CRAWL_STATE_DIR", os.path.join(CACHE_DIR, "crawls"))
+CRAWL_STATE_BATCH = int(os.getenv("CRAWL_STATE_BATCH", 50))             # writes per transaction
+CRAWL_STATE_FLUSH_SECONDS = float(os.getenv("CRAWL_STATE_FLUSH_SECONDS", 5))
+
+# Sharded crawl workers: 0 = off; N = shards (one worker per shard)
+DISTRIBUTED_WORKERS = int(os.getenv("DISTRIBUTED_WORKERS", 0))
+DISTRIBUTED_LOCAL = os.getenv("DISTRIBUTED_LOCAL", "true").lower() == "true"   # false: workers run elsewhere
+DISTRIBUTED_IDLE_TIMEOUT = float(os.getenv("DISTRIBUTED_IDLE_TIMEOUT", 300))    # seconds without results
+# "url": spread the site over all workers; "host": one worker per host (politeness
+# stays exact, but a single-site crawl then runs on one worker)
+DISTRIBUTED_SHARD_BY = os.getenv("DISTRIBUTED_SHARD_BY", "url").lower()
+WORK_QUEUE = os.getenv("WORK_QUEUE", "sqlite").lower()                          # "sqlite" or "memory"
+WORK_QUEUE_PATH = os.getenv("WORK_QUEUE_PATH", os.path.join(CACHE_DIR, "work_queue.sqlite"))
+WORK_QUEUE_POLL_SECONDS = float(os.getenv("WORK_QUEUE_POLL_SECONDS", 0.05))
+
+# Streaming pipeline (fetch → parse → extract → export)
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", 2))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 8))   # pages buffered between stages
+
+# Export: "txt" (human readable), "jsonl" or "csv" (streaming, machine readable)
+EXPORT_FORMAT = os.getenv("EXPORT_FORMAT", "txt").lower()
+EXPORT_COMPRESSION = os.getenv("EXPORT_COMPRESSION", "").lower() or None   # jsonl: gzip | zstd
+EXPORT_APPEND = os.getenv("EXPORT_APPEND", "false").lower() == "true"
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 20))                # records per flush
+
+# HTML parsing backend for static pages: "auto" (lxml when installed), "lxml" or "bs4"
+PARSER_BACKEND = os.getenv("PARSER_BACKEND", "auto").lower()
+
+# Parse/extract process pool: 0 = parse in-thread, N processes, or "auto" (one per core)
+PARSE_PROCESSES = os.getenv("PARSE_PROCESSES", "0")
+
+# Site-level boilerplate removal (text blocks repeated across crawled pages)
+BOILERPLATE_ENABLED = os.getenv("BOILERPLATE_ENABLED", "true").lower() == "true"
+BOILERPLATE_THRESHOLD = float(os.getenv("BOILERPLATE_THRESHOLD", 0.5))  # share of pages a block appears on
+BOILERPLATE_MIN_PAGES = int(os.getenv("BOILERPLATE_MIN_PAGES", 3))      # pages seen before stripping starts
+
+# LLM enhancement stage
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None   # e.g. a local mock server for tests
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4.1")
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", 4))       # requests in flight
+LLM_RPM = int(os.getenv("LLM_RPM", 500))                     # requests per minute budget
+LLM_TPM = int(os.getenv("LLM_TPM", 30000))                   # tokens per minute budget
+LLM_CHUNK_CHARS = int(os.getenv("LLM_CHUNK_CHARS", 6000))    # long texts are split, not truncated
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", os.path.join(CACHE_DIR, "llm"))
+
+# Near-duplicate page detection (SimHash)
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+DEDUP_MAX_DISTANCE = int(os.getenv("DEDUP_MAX_DISTANCE", 6))    # Hamming bits out of 64
+DEDUP_PERSIST = os.getenv("DEDUP_PERSIST", "false").lower() == "true"   # also match earlier runs
+DEDUP_DB = os.getenv("DEDUP_DB", os.path.join(CACHE_DIR, "fingerprints.sqlite"))
@@ -0,0 +1,95 @@
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+from config import FETCH_CONCURRENCY, PER_HOST_CONCURRENCY
+from core.logger import logger
+
+
+class FetchEngine:
+    """
+    Bounded thread-pool fetcher.
+
+    URLs are queued with submit() (also while iterating results()), and
+    dispatched to `worker(url)` as long as fewer than `concurrency` jobs
+    are in flight overall and fewer than `per_host` for that URL's host.
+    results() yields (url, result, error) in completion order.
+    """
+
+    def __init__(self, worker, concurrency=None, per_host=None):
+        self.worker = worker
+        self.concurrency = concurrency or FETCH_CONCURRENCY
+        self.per_host = per_host or PER_HOST_CONCURRENCY
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="fetch"
+        )
+        self._queued = defaultdict(deque)     # host -> urls waiting
+        self._hosts = deque()                 # round-robin order of hosts
+        self._host_inflight = defaultdict(int)
+        self._inflight = {}                   # future -> (url, host)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, url):
+        host = urlparse(url).netloc
+        if not self._queued[host]:
+            self._hosts.append(host)
+        self._queued[host].append(url)
+
+    def pending(self):
+        return len(self._inflight) + sum(len(q) for q in self._queued.values())
+
+    def _dispatch(self):
+        # Round-robin over hosts so one big host can't starve the others
+        for _ in range(len(self._hosts)):
+            if len(self._inflight) >= self.concurrency:
+                return
+
+            host = self._hosts.popleft()
+            queue = self._queued[host]
+
+            while queue and self._host_inflight[host] < self.per_host \
+                    and len(self._inflight) < self.concurrency:
+                url = queue.popleft()
+                future = self._executor.submit(self.worker, url)
+                self._inflight[future] = (url, host)
+                self._host_inflight[host] += 1
+
+            if queue:
+                self._hosts.append(host)
+            else:
+                del self._queued[host]
+
+    def results(self):
+        while True:
+            self._dispatch()
+            if not self._inflight:
+                return
+
+            done, _ = wait(self._inflight, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                url, host = self._inflight.pop(future)
+                self._host_inflight[host] -= 1
+
+                error = future.exception()
+                if error is not None:
+                    logger.debug(f"[FETCH] {url} failed: {error}")
+                    yield url, None, error
+                else:
+                    yield url, future.result(), None
+
+    def cancel_pending(self):
+        """Drop queued URLs; jobs already in flight still finish."""
+        self._queued.clear()
+        self._hosts.clear()
+
+    def close(self):
+        self.cancel_pending()
+        self._executor.shutdown(wait=False, cancel_futures=True)
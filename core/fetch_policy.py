@@ -0,0 +1,276 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+import requests
+
+from config import (
+    FETCH_RETRIES,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_STATUSES,
+    HEDGE_ENABLED,
+    HEDGE_PERCENTILE,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_WORKERS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS
+)
+from core.logger import logger
+
+# Transport errors worth another attempt; anything else (bad URL, too many
+# redirects, ...) fails the same way every time
+RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of contacting a host whose circuit breaker is open."""
+
+
+def backoff_delay(attempt, base=None, cap=None):
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    base = RETRY_BACKOFF_BASE if base is None else base
+    cap = RETRY_BACKOFF_MAX if cap is None else cap
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class HostHealth:
+    """
+    Circuit breaker, recent latencies and counters for one host.
+
+    After `threshold` consecutive failures the circuit opens and requests
+    fail fast with CircuitOpenError; after `reset_seconds` one trial
+    request is let through (half-open) and its outcome closes or re-opens
+    the circuit.
+    """
+
+    def __init__(self, host, threshold=None, reset_seconds=None, window=200):
+        self.host = host
+        self.threshold = CIRCUIT_FAILURE_THRESHOLD if threshold is None else threshold
+        self.reset_seconds = CIRCUIT_RESET_SECONDS if reset_seconds is None else reset_seconds
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_inflight = False
+        self.latencies = deque(maxlen=window)
+
+        self.counters = {
+            "requests": 0, "retries": 0, "failures": 0,
+            "hedges": 0, "hedge_wins": 0, "rejected": 0, "opened": 0
+        }
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self._trial_inflight = False
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_inflight:
+                self._trial_inflight = True
+                return True
+
+            self.counters["rejected"] += 1
+            return False
+
+    def record_success(self, latency=None):
+        with self._lock:
+            if latency is not None:
+                self.latencies.append(latency)
+            if self.state != CLOSED:
+                logger.info(f"[FETCH POLICY] Circuit for {self.host} closed")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._trial_inflight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.counters["failures"] += 1
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.consecutive_failures >= self.threshold
+            ):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._trial_inflight = False
+                self.counters["opened"] += 1
+                logger.warning(
+                    f"[FETCH POLICY] Circuit for {self.host} opened after "
+                    f"{self.consecutive_failures} consecutive failures"
+                )
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def latency_percentile(self, percentile):
+        with self._lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counters, state=self.state)
+
+
+def _discard(future):
+    # Losing hedge: release its connection once it finishes
+    if future.exception() is None:
+        response, _ = future.result()
+        response.close()
+
+
+class FetchPolicy:
+    """
+    Wraps a single-attempt `send()` (returning a requests.Response) with:
+
+    - the host's circuit breaker (CircuitOpenError when open)
+    - up to `retries` extra attempts on transport errors and
+      RETRY_STATUSES, with full-jitter exponential backoff
+    - optional hedging: when an attempt runs past the host's
+      HEDGE_PERCENTILE latency, a duplicate is sent and the first
+      response wins
+
+    Every failed attempt counts toward the host's circuit breaker, and a
+    request stops retrying as soon as the circuit opens, so a dead host
+    is cut off within a couple of requests. Any response below 500 other
+    than 429 counts as the host being healthy.
+    """
+
+    def __init__(self, retries=None, hedge=None):
+        self.retries = FETCH_RETRIES if retries is None else retries
+        self.hedge = HEDGE_ENABLED if hedge is None else hedge
+
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def health(self, url):
+        host = urlparse(url).netloc.lower()
+        health = self._hosts.get(host)
+        if health is None:
+            with self._lock:
+                health = self._hosts.setdefault(host, HostHealth(host))
+        return health
+
+    def _timed(self, send):
+        start = time.monotonic()
+        return send(), time.monotonic() - start
+
+    def _attempt(self, health, send, hedge, pace):
+        if pace is not None:
+            pace()
+
+        threshold = None
+        if hedge and len(health.latencies) >= HEDGE_MIN_SAMPLES:
+            threshold = health.latency_percentile(HEDGE_PERCENTILE)
+        if threshold is None:
+            return self._timed(send)
+
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=HEDGE_WORKERS, thread_name_prefix="hedge"
+                    )
+
+        primary = self._executor.submit(self._timed, send)
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+
+        def paced_send():
+            if pace is not None:
+                pace()
+            return send()
+
+        health.count("hedges")
+        hedge_future = self._executor.submit(self._timed, paced_send)
+        pending = {primary, hedge_future}
+
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is hedge_future:
+                    health.count("hedge_wins")
+                for other in pending:
+                    other.add_done_callback(_discard)
+                return future.result()
+        raise error
+
+    def execute(self, url, send, retries=None, hedge=None, pace=None):
+        """
+        Run `send()` under the policy. `pace()`, when given, is called
+        before every attempt (and hedge) outside the latency measurement,
+        e.g. the politeness scheduler's wait.
+        """
+        health = self.health(url)
+        retries = self.retries if retries is None else retries
+        hedge = self.hedge if hedge is None else hedge
+
+        if not health.allow():
+            raise CircuitOpenError(f"Circuit open for {health.host}, not fetching {url}")
+
+        for attempt in range(retries + 1):
+            health.count("requests")
+            last_attempt = attempt == retries
+            try:
+                r, latency = self._attempt(health, send, hedge, pace)
+            except RETRYABLE_ERRORS as e:
+                health.record_failure()
+                if last_attempt or health.state == OPEN:
+                    raise
+                logger.debug(f"[FETCH POLICY] {url} attempt {attempt + 1} failed: {e}")
+            except requests.RequestException:
+                # Not the host's fault (invalid URL, redirect loop, ...)
+                health.record_success()
+                raise
+            else:
+                if r.status_code not in RETRY_STATUSES:
+                    health.record_success(latency)
+                    return r
+                health.record_failure()
+                if last_attempt or health.state == OPEN:
+                    return r
+                logger.debug(f"[FETCH POLICY] {url} answered {r.status_code}, retrying")
+                r.close()
+
+            health.count("retries")
+            time.sleep(backoff_delay(attempt))
+
+    def stats(self):
+        return {host: h.snapshot() for host, h in self._hosts.items()}
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_policy = None
+_policy_lock = threading.Lock()
+
+
+def get_fetch_policy():
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                _policy = FetchPolicy()
+    return _policy
@@ -0,0 +1,154 @@
+import atexit
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+
+from config import (
+    REQUEST_TIMEOUT,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    USER_AGENT,
+    HTTP_CACHE_ENABLED
+)
+from core.fetch_policy import CircuitOpenError, get_fetch_policy
+from core.http_cache import HttpCache
+from core.logger import logger
+from core.politeness import get_scheduler
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    # gzip/deflate always; br/zstd when the decoders are installed
+    "Accept-Encoding": DEFAULT_ACCEPT_ENCODING,
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+    "Connection": "keep-alive"
+}
+
+_session = None
+_cache = None
+_lock = threading.Lock()
+
+
+def _build_session():
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        pool_block=False
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Process-wide pooled session; connections are reused across subsystems."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get_http_cache():
+    """Shared HttpCache when HTTP_CACHE_ENABLED, else None."""
+    global _cache
+    if HTTP_CACHE_ENABLED and _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = HttpCache()
+    return _cache
+
+
+def _send_once(url, scheduler, **kwargs):
+    r = get_session().get(url, **kwargs)
+
+    if scheduler is not None:
+        scheduler.observe(
+            url, r.status_code,
+            latency=r.elapsed.total_seconds(),
+            retry_after=r.headers.get("Retry-After")
+        )
+    return r
+
+
+def _send(url, retries=None, **kwargs):
+    # Every attempt waits for its host's politeness slot and reports its
+    # response; retries, hedging and the host's circuit breaker wrap the
+    # attempts. A request that failed outright slows the host down once,
+    # not once per retry.
+    scheduler = get_scheduler()
+    try:
+        return get_fetch_policy().execute(
+            url,
+            lambda: _send_once(url, scheduler, **kwargs),
+            retries=retries,
+            pace=(lambda: scheduler.wait(url)) if scheduler is not None else None
+        )
+    except CircuitOpenError:
+        raise
+    except requests.RequestException:
+        if scheduler is not None:
+            scheduler.failed(url)
+        raise
+
+
+def http_get(url, use_cache=True, retries=None, **kwargs):
+    """
+    GET through the shared session, politeness scheduler and fetch policy.
+
+    `retries` overrides FETCH_RETRIES for this call (0 = single attempt).
+    Raises CircuitOpenError (a RequestException) while the host's circuit
+    breaker is open.
+    """
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+
+    cache = get_http_cache() if use_cache else None
+    if cache is None:
+        return _send(url, retries=retries, **kwargs)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    headers.update(cache.conditional_headers(url))
+
+    r = _send(url, retries=retries, headers=headers, **kwargs)
+
+    if r.status_code == 304:
+        cached = cache.revalidated(url, r)
+        if cached is not None:
+            return cached
+        # Validators without a body on disk: fetch unconditionally
+        kwargs["headers"] = {
+            k: v for k, v in headers.items()
+            if k not in ("If-None-Match", "If-Modified-Since")
+        }
+        r = _send(url, retries=retries, **kwargs)
+
+    cache.misses += 1
+    cache.store(url, r)
+    return r
+
+
+def close_session():
+    global _session, _cache
+    scheduler = get_scheduler()
+    if scheduler is not None and scheduler.stats():
+        logger.info(f"[POLITENESS] {scheduler.stats()}")
+    policy = get_fetch_policy()
+    if policy.stats():
+        logger.info(f"[FETCH POLICY] {policy.stats()}")
+    policy.close()
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+        if _cache is not None:
+            logger.info(f"[HTTP CACHE] hits={_cache.hits} misses={_cache.misses}")
+            _cache.close()
+            _cache = None
+
+
+atexit.register(close_session)
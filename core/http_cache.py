@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config import HTTP_CACHE_DIR, HTTP_CACHE_MAX_MB
+from core.logger import logger
+
+# Bodies are stored already decoded, so transfer headers must not be replayed
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def cache_key_url(url):
+    """Scheme/host lower-cased, default port and fragment removed."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+class HttpCache:
+    """
+    Response bodies on disk plus a SQLite index of validators.
+
+    Only responses that carry an ETag or Last-Modified are stored: those
+    are the ones a later conditional request can turn into a 304.
+    Total body size is kept under `max_bytes` by evicting the least
+    recently used entries.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or HTTP_CACHE_DIR
+        self.max_bytes = max_bytes or HTTP_CACHE_MAX_MB * 1024 * 1024
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(self.directory, "index.sqlite"),
+            check_same_thread=False
+        )
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_access ON entries(last_access)")
+        self._db.commit()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(cache_key_url(url).encode("utf-8")).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".body")
+
+    def conditional_headers(self, url):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified FROM entries WHERE key = ?",
+                (self._key(url),)
+            ).fetchone()
+
+        if not row:
+            return {}
+
+        headers = {}
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def store(self, url, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+
+        key = self._key(url)
+        body = response.content
+        path = self._body_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+        headers = {
+            k: v for k, v in response.headers.items()
+            if k.lower() not in _DROP_HEADERS
+        }
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, cache_key_url(url), etag, last_modified,
+                 json.dumps(headers), len(body), time.time())
+            )
+            self._db.commit()
+            self._evict()
+
+    def revalidated(self, url, not_modified):
+        """Build a 200 Response from disk for a 304 answer; None if missing."""
+        key = self._key(url)
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT headers FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+        try:
+            with open(self._body_path(key), "rb") as f:
+                body = f.read()
+        except OSError:
+            row = None
+
+        if not row:
+            return None
+
+        headers = CaseInsensitiveDict(json.loads(row[0]))
+        # A 304 may carry refreshed validators
+        for h in ("ETag", "Last-Modified", "Cache-Control", "Expires", "Date"):
+            if h in not_modified.headers:
+                headers[h] = not_modified.headers[h]
+
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET etag = ?, last_modified = ?, headers = ?, last_access = ? WHERE key = ?",
+                (headers.get("ETag"), headers.get("Last-Modified"),
+                 json.dumps(dict(headers)), time.time(), key)
+            )
+            self._db.commit()
+
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = body
+        resp.headers = headers
+        resp.url = not_modified.url
+        resp.request = not_modified.request
+        resp.reason = "OK (revalidated)"
+        resp.from_cache = True
+
+        self.hits += 1
+        return resp
+
+    def _evict(self):
+        # Caller holds self._lock
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in self._db.execute(
+            "SELECT key, size FROM entries ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+
+        self._db.commit()
+        logger.info(f"[HTTP CACHE] Evicted {evicted} entries (now {total} bytes)")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
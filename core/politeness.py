@@ -0,0 +1,162 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from config import (
+    POLITENESS_ENABLED,
+    HOST_RATE_INITIAL,
+    HOST_RATE_MIN,
+    HOST_RATE_MAX,
+    HOST_RATE_STEP,
+    HOST_BACKOFF_FACTOR,
+    HOST_BURST,
+    HOST_LATENCY_TARGET,
+    HOST_MAX_RETRY_AFTER
+)
+from core.logger import logger
+from core.rate_limit import TokenBucket
+
+THROTTLE_STATUSES = (429, 503)
+
+# Gentler decrease when the host is merely slow rather than refusing us
+SLOW_FACTOR = 0.9
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After (delta-seconds or HTTP-date) → seconds to wait, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+class HostThrottle:
+    """
+    Request rate for one host.
+
+    AIMD: every fast, successful response adds `step` req/s (up to the
+    ceiling); a 429/503 multiplies the rate by `backoff`, a response
+    slower than `latency_target` by SLOW_FACTOR. Retry-After pauses the
+    host entirely. A robots.txt Crawl-delay caps the ceiling at one
+    request per delay, without bursts.
+    """
+
+    def __init__(self, host, rate=None, min_rate=None, max_rate=None):
+        self.host = host
+        self.min_rate = HOST_RATE_MIN if min_rate is None else min_rate
+        self.max_rate = HOST_RATE_MAX if max_rate is None else max_rate
+        self.rate = min(HOST_RATE_INITIAL if rate is None else rate, self.max_rate)
+
+        self.bucket = TokenBucket(self.rate, capacity=HOST_BURST)
+        self.paused_until = 0.0
+
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def _set_rate(self, rate):
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+        self.bucket.set_rate(self.rate)
+
+    def set_crawl_delay(self, delay):
+        if delay <= 0:
+            return
+        with self._lock:
+            self.max_rate = min(self.max_rate, 1.0 / delay)
+            self.min_rate = min(self.min_rate, self.max_rate)
+            self._set_rate(self.rate)
+            self.bucket.set_rate(self.rate, capacity=1)
+
+    def wait(self):
+        """Block until this host may receive another request; returns seconds waited."""
+        waited = 0.0
+        pause = self.paused_until - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+            waited += pause
+        return waited + self.bucket.acquire()
+
+    def observe(self, status, latency, retry_after=None):
+        with self._lock:
+            self.requests += 1
+
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+                self._set_rate(self.rate * HOST_BACKOFF_FACTOR)
+                delay = parse_retry_after(retry_after)
+                if delay is not None:
+                    delay = min(delay, HOST_MAX_RETRY_AFTER)
+                    self.paused_until = max(self.paused_until, time.monotonic() + delay)
+                logger.info(
+                    f"[POLITENESS] {self.host} answered {status}; "
+                    f"rate → {self.rate:.2f}/s" + (f", paused {delay:.0f}s" if delay else "")
+                )
+            elif latency is not None and latency > HOST_LATENCY_TARGET:
+                self._set_rate(self.rate * SLOW_FACTOR)
+            elif status is not None and status < 500:
+                self._set_rate(self.rate + HOST_RATE_STEP)
+
+    def failed(self):
+        """Connection error / timeout: treat like an overloaded host."""
+        with self._lock:
+            self.requests += 1
+            self._set_rate(self.rate * HOST_BACKOFF_FACTOR)
+
+
+class PolitenessScheduler:
+    """
+    One HostThrottle per host; fetchers call wait(url) before a request
+    and observe(url, ...) / failed(url) after it.
+    """
+
+    def __init__(self):
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def host(self, url):
+        host = urlparse(url).netloc.lower()
+        throttle = self._hosts.get(host)
+        if throttle is None:
+            with self._lock:
+                throttle = self._hosts.setdefault(host, HostThrottle(host))
+        return throttle
+
+    def wait(self, url):
+        return self.host(url).wait()
+
+    def observe(self, url, status, latency=None, retry_after=None):
+        self.host(url).observe(status, latency, retry_after)
+
+    def failed(self, url):
+        self.host(url).failed()
+
+    def set_crawl_delay(self, url, delay):
+        self.host(url).set_crawl_delay(delay)
+
+    def stats(self):
+        return {
+            host: {"rate": round(t.rate, 2), "requests": t.requests, "throttled": t.throttled}
+            for host, t in self._hosts.items()
+        }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Shared PolitenessScheduler when POLITENESS_ENABLED, else None."""
+    global _scheduler
+    if POLITENESS_ENABLED and _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = PolitenessScheduler()
+    return _scheduler
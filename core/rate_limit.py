@@ -0,0 +1,51 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, bursts up to
+    `capacity`. acquire() blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate, capacity=None):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+            if capacity is not None:
+                self.capacity = float(capacity)
+                self._tokens = min(self._tokens, self.capacity)
+
+    def try_acquire(self, amount=1):
+        """Take tokens without blocking; returns seconds to wait (0 = granted)."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            if self.rate <= 0:
+                return float("inf")
+            return (amount - self._tokens) / self.rate
+
+    def acquire(self, amount=1):
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(amount)
+            if wait == 0.0:
+                return waited
+            wait = min(wait, 1.0)
+            time.sleep(wait)
+            waited += wait
@@ -0,0 +1,130 @@
+import sys
+from itertools import repeat
+
+_FIELDS = ("tag", "text", "href", "src")
+
+
+class Element:
+    """
+    Read-only view of one element record.
+
+    Supports the dict access the rest of the code uses (`d.get("text")`,
+    `d["src"]`), so code written against the old list-of-dicts shape
+    keeps working.
+    """
+
+    __slots__ = _FIELDS
+
+    def __init__(self, tag, text, href, src):
+        self.tag = tag
+        self.text = text
+        self.href = href
+        self.src = src
+
+    def get(self, key, default=None):
+        if key in _FIELDS:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key):
+        if key not in _FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in _FIELDS
+
+    def keys(self):
+        return _FIELDS
+
+    def to_dict(self):
+        return {"tag": self.tag, "text": self.text, "href": self.href, "src": self.src}
+
+    def __repr__(self):
+        return f"Element({self.to_dict()!r})"
+
+
+class PageRecords:
+    """
+    Column-oriented container for a page's {"tag","text","href","src"} records.
+
+    One list per field instead of one dict per element; tag names are
+    interned so every "p"/"li"/"a" shares a single string. Iteration and
+    indexing yield Element views; hot paths read the columns directly.
+    """
+
+    __slots__ = ("tags", "texts", "hrefs", "srcs")
+
+    def __init__(self, tags=None, texts=None, hrefs=None, srcs=None):
+        self.tags = tags if tags is not None else []
+        self.texts = texts if texts is not None else []
+        self.hrefs = hrefs if hrefs is not None else []
+        self.srcs = srcs if srcs is not None else []
+
+    @classmethod
+    def from_dicts(cls, dicts):
+        records = cls()
+        for d in dicts:
+            records.append(d.get("tag"), d.get("text"), d.get("href"), d.get("src"))
+        return records
+
+    @classmethod
+    def from_columns(cls, columns):
+        return cls(
+            [sys.intern(t) if t else t for t in columns["tag"]],
+            columns["text"],
+            columns["href"],
+            columns["src"]
+        )
+
+    def append(self, tag, text, href, src):
+        self.tags.append(sys.intern(tag) if tag else tag)
+        self.texts.append(text)
+        self.hrefs.append(href)
+        self.srcs.append(src)
+
+    def __len__(self):
+        return len(self.tags)
+
+    def __iter__(self):
+        return map(Element, self.tags, self.texts, self.hrefs, self.srcs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PageRecords(
+                self.tags[index], self.texts[index],
+                self.hrefs[index], self.srcs[index]
+            )
+        return Element(self.tags[index], self.texts[index], self.hrefs[index], self.srcs[index])
+
+    def rows(self):
+        """(tag, text, href, src) tuples without building Element objects."""
+        return zip(self.tags, self.texts, self.hrefs, self.srcs)
+
+    def select_fields(self, fields):
+        """
+        Same contract as filter_fields(): blank text unless selected.
+        Columns are shared, not copied.
+        """
+        texts = self.texts if "text" in fields else list(repeat(None, len(self)))
+        return PageRecords(self.tags, texts, self.hrefs, self.srcs)
+
+    def to_dicts(self):
+        return [
+            {"tag": t, "text": x, "href": h, "src": s}
+            for t, x, h, s in self.rows()
+        ]
+
+    def to_columns(self):
+        """JSON-friendly form, see from_columns()."""
+        return {"tag": self.tags, "text": self.texts, "href": self.hrefs, "src": self.srcs}
+
+    def __repr__(self):
+        return f"PageRecords({len(self)} elements)"
+
+
+def as_page_records(data):
+    """Accept PageRecords or the legacy list of dicts."""
+    if isinstance(data, PageRecords):
+        return data
+    return PageRecords.from_dicts(data or [])
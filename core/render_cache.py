@@ -0,0 +1,63 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from config import CACHE_DIR, RENDER_CACHE_TTL
+from core.logger import logger
+
+RENDER_CACHE_FILE = os.path.join(CACHE_DIR, "render_strategy.json")
+
+_lock = threading.Lock()
+
+
+def _load_all():
+    try:
+        with open(RENDER_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_all(entries):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = RENDER_CACHE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2)
+    os.replace(tmp, RENDER_CACHE_FILE)   # atomic: never a half-written cache
+
+
+def get_render_strategy(url):
+    """Cached {"mode", "static_score", "dynamic_score", "decided_at", "ttl"} or None."""
+    host = urlparse(url).netloc
+    with _lock:
+        entry = _load_all().get(host)
+
+    if not entry:
+        return None
+
+    if entry["decided_at"] + entry.get("ttl", RENDER_CACHE_TTL) < time.time():
+        logger.info(f"[RENDER CACHE] Entry for {host} expired")
+        return None
+
+    return entry
+
+
+def save_render_strategy(url, mode, static_score, dynamic_score=None, ttl=None):
+    host = urlparse(url).netloc
+    entry = {
+        "mode": mode,
+        "static_score": static_score,
+        "dynamic_score": dynamic_score,
+        "decided_at": time.time(),
+        "ttl": ttl or RENDER_CACHE_TTL
+    }
+
+    with _lock:
+        entries = _load_all()
+        entries[host] = entry
+        _save_all(entries)
+
+    return entry
+
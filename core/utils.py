@@ -1,24 +1,26 @@
 import os
 from openai import OpenAI
 
+from config import OPENAI_BASE_URL
+
+from core.records import PageRecords, as_page_records
+
 # Detect whether LLM is available
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 LLM_ENABLED = bool(OPENAI_API_KEY)
 
-client = OpenAI(api_key=OPENAI_API_KEY) if LLM_ENABLED else None
+client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL) if LLM_ENABLED else None
 
 
 def content_score(data):
-    texts = [
-        d.get("text", "").strip()
-        for d in data
-        if d.get("text")
-    ]
+    records = as_page_records(data)
+
+    texts = [t.strip() for t in records.texts if t]
 
     long_text = sum(len(t) for t in texts if len(t) > 40)
     unique_text = len(set(texts))
-    list_items = sum(1 for d in data if d.get("tag") == "li")
-    images = sum(1 for d in data if d.get("src"))
+    list_items = records.tags.count("li")
+    images = sum(1 for s in records.srcs if s)
 
     return (
         long_text +
@@ -28,10 +30,31 @@ def content_score(data):
     )
 
 
+def filter_fields(data, fields=None):
+    """
+    Blank out unselected text while keeping tag/href/src,
+    which image, video and link extraction depend on.
+    """
+    if not fields:
+        return data
+
+    if isinstance(data, PageRecords):
+        return data.select_fields(fields)
+
+    return [{
+        "tag": d.get("tag"),
+        "text": d.get("text") if "text" in fields else None,
+        "href": d.get("href"),
+        "src": d.get("src")
+    } for d in data]
+
+
 def analyze_page_structure(raw_data):
-    has_text = any(d.get("text") for d in raw_data)
-    has_links = any(d.get("href") for d in raw_data)
-    has_images = any(d.get("src") for d in raw_data)
+    records = as_page_records(raw_data)
+
+    has_text = any(records.texts)
+    has_links = any(records.hrefs)
+    has_images = any(records.srcs)
 
     options = []
     if has_text:
@@ -71,47 +94,14 @@ def enhance_with_openai(text: str) -> str:
     """
     Uses GPT-4.1 ONLY if available.
     Otherwise returns text unchanged (rule-based fallback).
+
+    Long texts are chunked, results are cached on disk and calls are
+    rate-limited; see processing.llm_enhancer.LLMEnhancer.
     """
 
     # 🚫 LLM disabled → pure rule-based pipeline
     if not LLM_ENABLED:
         return text
 
-    if not text or len(text.strip()) < 50:
-        return text
-
-    # Safety cap (cost + latency)
-    text = text[:6000]
-
-    prompt = f"""
-You are refining website text.
-
-STRICT RULES:
-- DO NOT add new information
-- DO NOT remove factual content
-- DO NOT hallucinate
-- DO NOT mention scraping or AI
-- Remove navigation, cookies, footers
-- Improve clarity and readability
-- Preserve original meaning
-- Use clean paragraphs
-
-TEXT:
-{text}
-"""
-
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {"role": "system", "content": "You refine scraped web content without altering meaning."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.2
-        )
-
-        return response.choices[0].message.content.strip()
-
-    except Exception:
-        # 🔒 Absolute fallback — NEVER break scraper
-        return text
+    from processing.llm_enhancer import get_enhancer
+    return get_enhancer().enhance(text)
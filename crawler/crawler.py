@@ -1,41 +1,220 @@
 from urllib.parse import urljoin, urlparse
 import requests
-from bs4 import BeautifulSoup
+from core.fetch_engine import FetchEngine
+from core.http import http_get
 from core.logger import logger
+from core.utils import filter_fields
+from crawler.frontier import Frontier
+from processing.parse_pool import get_parse_pool
+from scrapers.html_parser import parse_html
 
 
-def crawl_site(start_url, max_pages=20):
-    visited = set()
-    to_visit = [start_url]
-    collected = []
+def _fetch_page(url, scrape, fields=None):
+    r = http_get(url)
+    r.raise_for_status()
 
-    domain = urlparse(start_url).netloc  # Domain restriction
-    logger.info(f"[STATIC CRAWLER] Starting crawl at {start_url} (max_pages={max_pages})")
+    # 🌳 Parse ONCE — links and element records come from the same tree.
+    # With a parse pool, the page is extracted in the same worker call too.
+    pool = get_parse_pool()
+    extracted = None
+    if pool is not None and scrape:
+        data, hrefs, extracted = pool.parse_and_build(r.content, url, fields)
+    elif pool is not None:
+        data, hrefs = pool.parse(r.content, records=False)
+    else:
+        data, hrefs = parse_html(r.content, records=scrape)
+    # Relative links resolve against where we ended up, after redirects
+    return data, hrefs, r.url, extracted
+
+
+def _top_up(engine, frontier, depths, budget):
+    # Never have more pages queued/in flight than we still need
+    while frontier and engine.pending() < budget:
+        url, depth = frontier.pop()
+        depths[url] = depth
+        engine.submit(url)
+
+
+def _push(frontier, state, url, depth, priority=0):
+    accepted = frontier.push(url, depth=depth, priority=priority)
+    if accepted and state is not None:
+        state.enqueue(accepted, depth, priority)
+    return accepted
+
+
+def seed_frontier(frontier, start_url, label, state=None, discovery=None):
+    """Queue the start URL and, with a SiteDiscovery, the site's sitemap URLs."""
+    # The start URL always goes first, ahead of any sitemap seed
+    _push(frontier, state, start_url, 0, float("-inf") if discovery else 0)
+    if discovery is None:
+        return
+
+    seeded = 0
+    for url, priority in discovery.seeds():
+        if _push(frontier, state, url, 1, priority):
+            seeded += 1
+    # Unchanged since the last run: don't re-fetch them via links either
+    for url in discovery.unchanged:
+        frontier.mark_seen(url)
+    logger.info(f"[{label}] Seeded {seeded} URLs from sitemaps")
 
-    while to_visit and len(collected) < max_pages:
-        url = to_visit.pop(0)
-        if url in visited:
-            continue
 
-        visited.add(url)
-        logger.info(f"[STATIC CRAWLER] Visiting: {url}")
+def record_page(frontier, hosts, url, depth, hrefs, base, page_data=None,
+                state=None, discovery=None):
+    """
+    Book-keeping for one fetched page, shared by run_crawl and the
+    distributed coordinator: queue its links on the crawl's `hosts`
+    (resolved against the final URL `base`, filtered by robots.txt) and
+    mark it done. Returns the page's same-domain links.
 
-        try:
-            r = requests.get(url, timeout=10)
-            r.encoding = "utf-8"   # 🔧 FIX HERE
-            soup = BeautifulSoup(r.text, "lxml")
-            r.raise_for_status()
-        except requests.RequestException as e:
-            logger.warning(f"[STATIC CRAWLER] Failed to fetch {url}: {e}")
+    When the start page redirects to another host (x.com → www.x.com),
+    that host joins `hosts`, and is saved in the state's meta for resume.
+    """
+    if base != url:
+        frontier.mark_seen(base)  # Redirect target: don't fetch it again
+        host = urlparse(base).netloc.lower()
+        if depth == 0 and host not in hosts:
+            hosts.add(host)
+            if state is not None:
+                state.set_meta(crawl_hosts=sorted(hosts))
+
+    links = []
+    for href in hrefs:
+        if not href:
             continue
+        link = urljoin(base, href)
+        if urlparse(link).netloc.lower() in hosts:
+            links.append(link)
+            if discovery is not None and not discovery.allowed(link):
+                continue
+            _push(frontier, state, link, depth + 1)
+
+    if state is not None:
+        state.complete(url, page_data)
+    if discovery is not None:
+        discovery.completed(url)
+    return links
+
+
+def run_crawl(start_url, max_pages, worker, label, scrape, fields=None,
+              recoverable=(Exception,), concurrency=None, per_host=None,
+              frontier=None, state=None, discovery=None):
+    """
+    Shared crawl loop for the static and browser crawlers.
+
+    `worker(url)` returns (page_data, hrefs, final_url, extracted) and runs
+    on a FetchEngine thread; `extracted` is the page already run through
+    build_page() when the worker did that too, else None. Hrefs are resolved against the final (post-redirect)
+    URL; same-domain links then go through the Frontier, which de-duplicates
+    them by canonical form at enqueue time.
+
+    With a CrawlStateStore as `state`, every accepted URL and finished
+    page is checkpointed; if the store already holds progress the crawl
+    resumes from it, replaying previously finished pages first.
+
+    With a SiteDiscovery as `discovery`, robots.txt rules filter every
+    link, requests go one at a time under a Crawl-delay, and the frontier is
+    seeded from the site's sitemaps, newest lastmod first.
+    """
+    frontier = frontier or Frontier(prioritized=discovery is not None)
+    depths = {}
+    collected = 0
+
+    hosts = {urlparse(start_url).netloc.lower()}  # Domain restriction
+    logger.info(f"[{label}] Starting crawl at {start_url} (max_pages={max_pages}, scrape={scrape})")
+
+    if state is not None and state.has_progress():
+        state.restore_frontier(frontier)
+        hosts.update(state.get_meta().get("crawl_hosts", ()))
+        for page in state.completed_pages():
+            if collected >= max_pages:
+                break
+            collected += 1
+            yield page
+        logger.info(f"[{label}] Resumed with {collected} pages already done")
+    else:
+        seed_frontier(frontier, start_url, label, state, discovery)
+
+    if discovery is not None and discovery.crawl_delay:
+        # The politeness scheduler spaces the requests; keep them sequential too
+        per_host = 1
+        logger.info(f"[{label}] Honoring Crawl-delay of {discovery.crawl_delay}s")
+
+    with FetchEngine(worker, concurrency=concurrency, per_host=per_host) as engine:
+        # Pages replayed from a checkpoint already count toward the budget
+        _top_up(engine, frontier, depths, max_pages - collected)
+
+        for url, result, error in engine.results():
+            depth = depths.pop(url, 0)
+
+            if error is not None:
+                if not isinstance(error, recoverable):
+                    raise error
+                logger.warning(f"[{label}] Failed to fetch {url}: {error}")
+                if state is not None:
+                    state.fail(url, error)
+                _top_up(engine, frontier, depths, max_pages - collected)
+                continue
+
+            collected += 1
+            logger.info(f"[{label}] Visited: {url}")
+
+            data, hrefs, base, extracted = result
+            page_data = filter_fields(data, fields) if scrape else None
+            links = record_page(frontier, hosts, url, depth, hrefs, base, page_data,
+                                state, discovery)
+
+            _top_up(engine, frontier, depths, max_pages - collected)
+
+            page = {
+                "page_url": url,
+                "page_data": page_data,
+                "links": links
+            }
+            if extracted is not None:
+                page["extracted"] = extracted  # extract_pages() skips the rebuild
+            yield page
+
+    if state is not None:
+        state.flush()
+
+    if frontier.rejected:
+        logger.info(f"[{label}] Frontier rejected: {dict(frontier.rejected)}")
+    logger.info(f"[{label}] Crawl completed. Pages collected: {collected}")
+
+
+def _crawl(start_url, max_pages, scrape, fields=None, concurrency=None, per_host=None,
+           state=None, discovery=None):
+    yield from run_crawl(
+        start_url, max_pages,
+        worker=lambda u: _fetch_page(u, scrape, fields),
+        label="STATIC CRAWLER",
+        scrape=scrape,
+        fields=fields,
+        recoverable=requests.RequestException,
+        concurrency=concurrency,
+        per_host=per_host,
+        state=state,
+        discovery=discovery
+    )
+
+
+def crawl_site(start_url, max_pages=20, concurrency=None, per_host=None, state=None, discovery=None):
+    return [
+        page["page_url"]
+        for page in _crawl(start_url, max_pages, scrape=False, concurrency=concurrency,
+                           per_host=per_host, state=state, discovery=discovery)
+    ]
 
-        collected.append(url)
 
-        soup = BeautifulSoup(r.text, "lxml")
-        for a in soup.find_all("a", href=True):
-            link = urljoin(url, a["href"])
-            if urlparse(link).netloc == domain and link not in visited:
-                to_visit.append(link)
+def crawl_and_scrape(start_url, max_pages=20, fields=None, concurrency=None, per_host=None,
+                     state=None, discovery=None):
+    """
+    Fused crawl: every page is downloaded and parsed exactly once.
 
-    logger.info(f"[STATIC CRAWLER] Crawl completed. Pages collected: {len(collected)}")
-    return collected
+    Pages are fetched concurrently through FetchEngine and yielded as
+    {"page_url", "page_data", "links"} in completion order, where
+    page_data has the same record shape as scrape_static().
+    """
+    yield from _crawl(start_url, max_pages, scrape=True, fields=fields, concurrency=concurrency,
+                      per_host=per_host, state=state, discovery=discovery)
@@ -1,46 +1,65 @@
-from urllib.parse import urljoin, urlparse
-from playwright.sync_api import sync_playwright
-from core.logger import logger
+from crawler.crawler import run_crawl
+from scrapers.browser_pool import get_browser_pool
+from scrapers.dynamic_scraper import (
+    prepare_page,
+    extract_dynamic_elements,
+    polite_goto,
+    track_network
+)
 
 
-def crawl_site_browser(start_url, max_pages=20):
-    visited = set()
-    collected = []
-    to_visit = [start_url]
+def _visit(page, url, scrape):
+    # Runs on a pooled browser worker
+    network = track_network(page) if scrape else None
+    try:
+        polite_goto(page, url)
+        if scrape:
+            # Same settle + scroll as scrape_dynamic, on the SAME render
+            prepare_page(page, network)
+        else:
+            page.wait_for_load_state("networkidle")
+    finally:
+        if network is not None:
+            network.close()
 
-    domain = urlparse(start_url).netloc
-    logger.info(f"[DYNAMIC CRAWLER] Starting browser crawl at {start_url} (max_pages={max_pages})")
+    data = extract_dynamic_elements(page) if scrape else None
+    hrefs = page.eval_on_selector_all(
+        "a[href]", "els => els.map(a => a.getAttribute('href'))"
+    )
+    # Extracted later, in the parent (no parse pool for rendered pages)
+    return data, hrefs, page.url, None
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
 
-        while to_visit and len(collected) < max_pages:
-            url = to_visit.pop(0)
-            if url in visited:
-                continue
+def _crawl_browser(start_url, max_pages, scrape, fields=None, state=None, discovery=None):
+    pool = get_browser_pool()
 
-            visited.add(url)
-            logger.info(f"[DYNAMIC CRAWLER] Visiting: {url}")
+    # One in-flight render per pooled browser
+    yield from run_crawl(
+        start_url, max_pages,
+        worker=lambda u: pool.run(_visit, u, scrape),
+        label="DYNAMIC CRAWLER",
+        scrape=scrape,
+        fields=fields,
+        concurrency=pool.size,
+        per_host=pool.size,
+        state=state,
+        discovery=discovery
+    )
 
-            try:
-                page.goto(url, timeout=60000)
-                page.wait_for_load_state("networkidle")
-            except Exception as e:
-                logger.warning(f"[DYNAMIC CRAWLER] Failed to load {url}: {e}")
-                continue
 
-            collected.append(url)
+def crawl_site_browser(start_url, max_pages=20, state=None, discovery=None):
+    return [
+        page["page_url"]
+        for page in _crawl_browser(start_url, max_pages, scrape=False,
+                                   state=state, discovery=discovery)
+    ]
 
-            for a in page.query_selector_all("a[href]"):
-                href = a.get_attribute("href")
-                if not href:
-                    continue
-                full = urljoin(url, href)
-                if urlparse(full).netloc == domain and full not in visited:
-                    to_visit.append(full)
 
-        browser.close()
-
-    logger.info(f"[DYNAMIC CRAWLER] Crawl completed. Pages collected: {len(collected)}")
-    return collected
+def crawl_and_scrape_browser(start_url, max_pages=20, fields=None, state=None, discovery=None):
+    """
+    Fused browser crawl: each page is rendered once and both its element
+    records (same shape as scrape_dynamic()) and its links are read from
+    that single render. Renders run in parallel on the browser pool.
+    """
+    yield from _crawl_browser(start_url, max_pages, scrape=True, fields=fields,
+                              state=state, discovery=discovery)
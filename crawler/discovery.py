@@ -0,0 +1,120 @@
+import os
+import sqlite3
+import threading
+from urllib.parse import urljoin, urlparse
+
+from config import SITEMAP_MAX_URLS, SITEMAP_INCREMENTAL, SITEMAP_DB
+from core.logger import logger
+from core.politeness import get_scheduler
+from crawler.frontier import canonicalize_url
+from crawler.robots import RobotsRules
+from crawler.sitemap import iter_sitemap
+
+
+class LastmodStore:
+    """SQLite record of the sitemap lastmod each page had when we last crawled it."""
+
+    def __init__(self, path=None):
+        path = path or SITEMAP_DB
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS crawled ("
+            "url TEXT PRIMARY KEY, lastmod REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            row = self._db.execute("SELECT lastmod FROM crawled WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def record(self, url, lastmod):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO crawled VALUES (?, ?)", (url, lastmod))
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class SiteDiscovery:
+    """
+    robots.txt + sitemap discovery for one site.
+
+    - `allowed(url)` applies the robots.txt disallow rules
+    - Crawl-delay is handed to the politeness scheduler for the host
+    - `seeds()` streams same-domain sitemap URLs as (url, priority);
+      newer lastmod → lower priority value → crawled first. With
+      `incremental`, pages whose lastmod has not moved since they were
+      last crawled are skipped (listed in `unchanged`); `completed(url)`
+      records a crawled page.
+    """
+
+    def __init__(self, start_url, incremental=None, max_urls=None, lastmod_store=None):
+        self.start_url = start_url
+        self.domain = urlparse(start_url).netloc.lower()
+        self.max_urls = SITEMAP_MAX_URLS if max_urls is None else max_urls
+        self.incremental = SITEMAP_INCREMENTAL if incremental is None else incremental
+
+        self.robots = RobotsRules.fetch(start_url)
+        scheduler = get_scheduler()
+        if self.crawl_delay and scheduler is not None:
+            scheduler.set_crawl_delay(start_url, self.crawl_delay)
+        self.lastmods = lastmod_store or (LastmodStore() if self.incremental else None)
+
+        self._seed_lastmod = {}
+        self.unchanged = []
+        self.disallowed = 0
+
+    @property
+    def crawl_delay(self):
+        return self.robots.crawl_delay
+
+    def allowed(self, url):
+        if self.robots.allowed(url):
+            return True
+        self.disallowed += 1
+        return False
+
+    def sitemap_urls(self):
+        # robots.txt "Sitemap:" lines, else the conventional location
+        return self.robots.sitemaps or [urljoin(self.start_url, "/sitemap.xml")]
+
+    def seeds(self):
+        streamed = 0
+        for sitemap in self.sitemap_urls():
+            for url, lastmod in iter_sitemap(sitemap):
+                if streamed >= self.max_urls:
+                    logger.info(f"[DISCOVERY] Sitemap seed limit reached ({self.max_urls})")
+                    return
+                streamed += 1
+
+                if urlparse(url).netloc.lower() != self.domain or not self.allowed(url):
+                    continue
+
+                canonical = canonicalize_url(url)
+                if lastmod is not None and self.lastmods is not None:
+                    previous = self.lastmods.get(canonical)
+                    if previous is not None and lastmod <= previous:
+                        self.unchanged.append(canonical)
+                        continue
+                    self._seed_lastmod[canonical] = lastmod
+
+                yield url, (-lastmod if lastmod is not None else 0)
+
+    def completed(self, url):
+        url = canonicalize_url(url)
+        lastmod = self._seed_lastmod.pop(url, None)
+        if lastmod is not None:
+            self.lastmods.record(url, lastmod)
+
+    def close(self):
+        if self.unchanged or self.disallowed:
+            logger.info(
+                f"[DISCOVERY] Skipped {len(self.unchanged)} unchanged and "
+                f"{self.disallowed} robots-disallowed URLs"
+            )
+        if self.lastmods is not None:
+            self.lastmods.close()
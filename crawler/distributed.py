@@ -0,0 +1,217 @@
+import multiprocessing
+import threading
+import time
+from urllib.parse import urlparse
+
+from config import (
+    DISTRIBUTED_WORKERS,
+    DISTRIBUTED_LOCAL,
+    DISTRIBUTED_IDLE_TIMEOUT,
+    DISTRIBUTED_SHARD_BY,
+    WORK_QUEUE,
+    WORK_QUEUE_PATH,
+    PER_HOST_CONCURRENCY
+)
+from core.fetch_engine import FetchEngine
+from core.http import http_get
+from core.logger import logger
+from core.utils import filter_fields
+from crawler.crawler import record_page, seed_frontier
+from crawler.crawler_browser import _visit
+from crawler.frontier import Frontier
+from crawler.work_queue import SQLiteQueue, open_queue, shard_for
+from processing.pipeline import build_page
+from scrapers.browser_pool import get_browser_pool
+from scrapers.html_parser import parse_html
+
+STOP = {"stop": True}
+
+
+def _scrape(url, site_type, fields):
+    # Same fetch + parse the fused crawlers use: records and links from one download/render.
+    # Parsed in-process: the workers already are the parallelism (no nested parse pool)
+    if site_type == "STATIC":
+        r = http_get(url)
+        r.raise_for_status()
+        data, hrefs = parse_html(r.content)
+        base = r.url
+    else:
+        data, hrefs, base, _ = get_browser_pool().run(_visit, url, True)
+    return filter_fields(data, fields), hrefs, base
+
+
+def process_task(task):
+    """Scrape + extract one URL; returns the result message for the coordinator."""
+    url = task["url"]
+    result = {
+        "url": url, "depth": task["depth"], "hrefs": [], "base": url,
+        "page": None, "error": None
+    }
+    try:
+        data, hrefs, base = _scrape(url, task["site_type"], task["fields"])
+        result["hrefs"], result["base"] = hrefs, base
+        if data:
+            # LLM enhancement runs in the coordinator, after near-duplicates are dropped
+            result["page"] = build_page({"page_url": url, "page_data": data}, enhance=False)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def run_worker(work_queue, shard):
+    """
+    Serve one shard until the coordinator sends STOP.
+
+    Claimed tasks run on a FetchEngine, so one worker keeps up to
+    PER_HOST_CONCURRENCY pages per host in flight, like run_crawl does.
+    Only this thread touches the queue.
+    """
+    logger.info(f"[WORKER {shard}] Started")
+    tasks = {}
+    served = 0
+    stopping = False
+
+    with FetchEngine(lambda url: process_task(tasks[url])) as engine:
+        while not stopping or tasks:
+            # Claim while there is room; only wait on the queue when idle
+            while not stopping and len(tasks) < engine.concurrency:
+                task = work_queue.get_task(shard, timeout=0 if tasks else 1.0)
+                if task is None:
+                    break
+                if task.get("stop"):
+                    stopping = True
+                    break
+                tasks[task["url"]] = task
+                engine.submit(task["url"])
+
+            # Hand back the first finished page, then claim again
+            for url, result, error in engine.results():
+                tasks.pop(url)
+                work_queue.put_result(result)
+                served += 1
+                break
+
+    logger.info(f"[WORKER {shard}] Stopped after {served} pages")
+
+
+def serve_shard(path, shard):
+    """Worker process entry point (local spawn or `main.py --worker`): reopen the shared queue."""
+    work_queue = SQLiteQueue(path)
+    try:
+        run_worker(work_queue, shard)
+    finally:
+        work_queue.close()
+
+
+def _start_local_workers(work_queue, shards):
+    if work_queue.local_only:
+        workers = [
+            threading.Thread(target=run_worker, args=(work_queue, i), name=f"worker-{i}", daemon=True)
+            for i in range(shards)
+        ]
+    else:
+        # spawn, not fork: the parent already runs HTTP/browser threads
+        ctx = multiprocessing.get_context("spawn")
+        workers = [
+            ctx.Process(target=serve_shard, args=(work_queue.path, i), name=f"worker-{i}", daemon=True)
+            for i in range(shards)
+        ]
+    for w in workers:
+        w.start()
+    return workers
+
+
+def distributed_crawl(start_url, max_pages, site_type, fields=None, shards=None,
+                      work_queue=None, local=None, idle_timeout=None, shard_by=None,
+                      discovery=None):
+    """
+    Coordinator: owns the Frontier, shards URLs by URL (or host, see
+    shard_for) hash over `shards` workers and yields the extracted pages they report back
+    (same shape as extract_pages() output, without LLM enhancement: run
+    enhance_pages() on them). Up to PER_HOST_CONCURRENCY
+    tasks are out at a time, the same per-host cap run_crawl keeps.
+
+    Workers are threads for the in-process queue and spawned processes
+    for the SQLite queue. With local=False none are started here; run
+    `python main.py --worker SHARD --queue PATH` on any machine that
+    sees the queue file instead.
+
+    Seeding and link following share seed_frontier()/record_page() with
+    run_crawl, so a SiteDiscovery as `discovery` applies the same way.
+    Under its Crawl-delay tasks go out one at a time, spaced by the delay
+    here (workers in other processes don't share this process's
+    politeness scheduler).
+    """
+    shards = shards or DISTRIBUTED_WORKERS
+    local = DISTRIBUTED_LOCAL if local is None else local
+    idle_timeout = DISTRIBUTED_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+    shard_by = shard_by or DISTRIBUTED_SHARD_BY
+    work_queue = work_queue or open_queue(WORK_QUEUE, shards, WORK_QUEUE_PATH)
+
+    frontier = Frontier(prioritized=discovery is not None)
+    hosts = {urlparse(start_url).netloc.lower()}
+    inflight = 0
+    collected = 0
+
+    crawl_delay = discovery.crawl_delay if discovery is not None else None
+    window = 1 if crawl_delay else PER_HOST_CONCURRENCY
+    next_dispatch = 0.0
+    if crawl_delay:
+        logger.info(f"[COORDINATOR] Honoring Crawl-delay of {crawl_delay}s")
+
+    def dispatch():
+        nonlocal inflight, next_dispatch
+        while frontier and inflight < min(window, max_pages - collected):
+            if crawl_delay:
+                time.sleep(max(0.0, next_dispatch - time.monotonic()))
+                next_dispatch = time.monotonic() + crawl_delay
+            url, depth = frontier.pop()
+            work_queue.put_task(shard_for(url, shards, shard_by), {
+                "url": url, "depth": depth, "site_type": site_type, "fields": fields
+            })
+            inflight += 1
+
+    logger.info(
+        f"[COORDINATOR] Crawling {start_url} with {shards} {'local' if local else 'remote'} "
+        f"workers via {type(work_queue).__name__} (max_pages={max_pages})"
+    )
+
+    workers = _start_local_workers(work_queue, shards) if local else []
+    seed_frontier(frontier, start_url, "COORDINATOR", discovery=discovery)
+
+    try:
+        dispatch()
+        idle_since = time.monotonic()
+
+        while inflight:
+            result = work_queue.get_result(timeout=1.0)
+            if result is None:
+                if workers and not any(w.is_alive() for w in workers):
+                    raise RuntimeError("All crawl workers exited")
+                if time.monotonic() - idle_since > idle_timeout:
+                    logger.warning(f"[COORDINATOR] No results for {idle_timeout}s, giving up on {inflight} URLs")
+                    break
+                continue
+
+            idle_since = time.monotonic()
+            inflight -= 1
+
+            if result["error"]:
+                logger.warning(f"[COORDINATOR] {result['url']} failed: {result['error']}")
+            else:
+                collected += 1
+                record_page(frontier, hosts, result["url"], result["depth"],
+                            result["hrefs"], result["base"], discovery=discovery)
+
+            dispatch()
+
+            if result["page"] is not None:
+                yield result["page"]
+    finally:
+        for shard in range(shards):
+            work_queue.put_task(shard, STOP)
+        for w in workers:
+            w.join(timeout=30)
+        work_queue.close()
+
+    logger.info(f"[COORDINATOR] Crawl completed. Pages collected: {collected}")
@@ -0,0 +1,165 @@
+import hashlib
+import heapq
+import math
+from collections import defaultdict, deque
+from itertools import count
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from config import (
+    CRAWL_MAX_DEPTH,
+    CRAWL_MAX_QUERY_VARIANTS,
+    CRAWL_MAX_URL_LENGTH,
+    CRAWL_BLOOM_CAPACITY,
+    TRACKING_PARAMS
+)
+
+_EXACT_TRACKING = {p for p in TRACKING_PARAMS if not p.endswith("*")}
+_PREFIX_TRACKING = tuple(p[:-1] for p in TRACKING_PARAMS if p.endswith("*"))
+
+
+def _is_tracking_param(name):
+    name = name.lower()
+    return name in _EXACT_TRACKING or name.startswith(_PREFIX_TRACKING)
+
+
+def canonicalize_url(url):
+    """
+    One spelling per page:
+    - scheme/host lower-cased, default ports dropped
+    - #fragment removed
+    - tracking parameters (TRACKING_PARAMS, `*` = prefix) removed
+    - remaining query parameters sorted
+    - trailing slash removed except for the root path
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(k)
+    ))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set for million-URL crawls (no false negatives)."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class Frontier:
+    """
+    Crawl queue with enqueue-time de-duplication.
+
+    URLs are checked against the seen-set when pushed, so every page is
+    queued at most once. The canonical form is only the seen-set key: the
+    URL is queued (and fetched) as given, since e.g. a stripped trailing
+    slash changes how the page's relative links resolve. FIFO (deque) by default; with
+    prioritized=True lower `priority` values pop first (ties FIFO).
+    Trap guards reject URLs deeper than `max_depth`, longer than
+    `max_url_length`, or beyond `max_query_variants` distinct query
+    strings for the same path.
+    """
+
+    def __init__(self, max_depth=None, max_query_variants=None, max_url_length=None,
+                 bloom_capacity=None, prioritized=False):
+        self.max_depth = CRAWL_MAX_DEPTH if max_depth is None else max_depth
+        self.max_query_variants = (
+            CRAWL_MAX_QUERY_VARIANTS if max_query_variants is None else max_query_variants
+        )
+        self.max_url_length = CRAWL_MAX_URL_LENGTH if max_url_length is None else max_url_length
+
+        bloom_capacity = CRAWL_BLOOM_CAPACITY if bloom_capacity is None else bloom_capacity
+        self.seen = BloomFilter(bloom_capacity) if bloom_capacity else set()
+
+        self.prioritized = prioritized
+        self._queue = [] if prioritized else deque()
+        self._order = count()
+        self._query_variants = defaultdict(int)
+
+        self.rejected = defaultdict(int)
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __bool__(self):
+        return bool(self._queue)
+
+    def __contains__(self, url):
+        return canonicalize_url(url) in self.seen
+
+    def mark_seen(self, url):
+        self.seen.add(canonicalize_url(url))
+
+    def push(self, url, depth=0, priority=0):
+        """Queue `url`; returns it (fragment removed), or None if rejected."""
+        url = url.strip().split("#", 1)[0]
+        key = canonicalize_url(url)
+
+        if key in self.seen:
+            return None
+
+        if depth > self.max_depth:
+            self.rejected["depth"] += 1
+            return None
+
+        if len(key) > self.max_url_length:
+            self.rejected["length"] += 1
+            return None
+
+        parts = urlsplit(key)
+        if parts.query:
+            path_key = (parts.netloc, parts.path)
+            if self._query_variants[path_key] >= self.max_query_variants:
+                self.rejected["query_variants"] += 1
+                return None
+            self._query_variants[path_key] += 1
+
+        self.seen.add(key)
+
+        if self.prioritized:
+            heapq.heappush(self._queue, (priority, next(self._order), url, depth))
+        else:
+            self._queue.append((url, depth))
+
+        return url
+
+    def restore(self, url, depth=0, priority=0):
+        """Re-queue a URL from a checkpoint, bypassing the trap guards."""
+        self.seen.add(canonicalize_url(url))
+        if self.prioritized:
+            heapq.heappush(self._queue, (priority, next(self._order), url, depth))
+        else:
+            self._queue.append((url, depth))
+
+    def pop(self):
+        """Next (url, depth)."""
+        if self.prioritized:
+            _, _, url, depth = heapq.heappop(self._queue)
+            return url, depth
+        return self._queue.popleft()
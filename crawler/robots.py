@@ -0,0 +1,107 @@
+from urllib.parse import urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from config import ROBOTS_USER_AGENT
+from core.http import http_get
+from core.logger import logger
+
+
+def robots_url(url):
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, "/robots.txt", "", ""))
+
+
+def parse_crawl_delay(text, user_agent):
+    """
+    Crawl-delay for `user_agent` (its own group first, then `*`).
+
+    urllib.robotparser only accepts whole seconds; "0.5" is common.
+    """
+    user_agent = user_agent.lower()
+    delays = {}
+    agents = []
+    in_rules = False
+
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        key, value = (part.strip() for part in line.split(":", 1))
+        key = key.lower()
+
+        if key == "user-agent":
+            if in_rules:
+                agents = []
+                in_rules = False
+            agents.append(value.lower())
+            continue
+
+        in_rules = True
+        if key == "crawl-delay":
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in agents:
+                delays.setdefault(agent, delay)
+
+    for agent, delay in delays.items():
+        if agent != "*" and agent in user_agent:
+            return delay
+    return delays.get("*", 0.0)
+
+
+class RobotsRules:
+    """
+    Parsed robots.txt for one host.
+
+    Missing robots.txt (4xx) allows everything, 401/403 and 5xx disallow
+    everything — the same rules urllib.robotparser applies — and a
+    network error is treated as "allow". Rules and `crawl_delay` (in
+    seconds) are both looked up for ROBOTS_USER_AGENT, a product token:
+    the full User-Agent header would only be matched up to its first "/".
+    """
+
+    def __init__(self, url, text=None, disallow_all=False, user_agent=None):
+        self.url = url
+        self.user_agent = user_agent or ROBOTS_USER_AGENT
+
+        self._parser = RobotFileParser(url)
+        if disallow_all:
+            self._parser.disallow_all = True
+        elif text is None:
+            self._parser.allow_all = True
+        else:
+            self._parser.parse(text.splitlines())
+        # RobotFileParser answers "disallowed" until it has a fetch time
+        self._parser.modified()
+
+        self.crawl_delay = parse_crawl_delay(text, self.user_agent) if text else 0.0
+        self.sitemaps = self._parser.site_maps() or []
+
+    @classmethod
+    def fetch(cls, site_url):
+        url = robots_url(site_url)
+        try:
+            r = http_get(url)
+        except requests.RequestException as e:
+            logger.warning(f"[ROBOTS] Could not fetch {url}: {e}")
+            return cls(url)
+
+        if r.status_code in (401, 403) or r.status_code >= 500:
+            rules = cls(url, disallow_all=True)
+        elif r.status_code >= 400:
+            rules = cls(url)
+        else:
+            rules = cls(url, r.text)
+
+        logger.info(
+            f"[ROBOTS] {url}: status={r.status_code}, crawl_delay={rules.crawl_delay}s, "
+            f"sitemaps={len(rules.sitemaps)}"
+        )
+        return rules
+
+    def allowed(self, url):
+        return self._parser.can_fetch(self.user_agent, url)
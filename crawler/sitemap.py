@@ -0,0 +1,110 @@
+import gzip
+import io
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+import requests
+
+from core.http import http_get
+from core.logger import logger
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_lastmod(value):
+    """W3C datetime ("2024-05-01", "2024-05-01T10:00:00Z", ...) → UTC epoch, or None."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _open_stream(r):
+    """File object over the response body, transparently gunzipped."""
+    r.raw.decode_content = True
+    # Keep urllib3 from closing the raw stream at EOF under the buffer
+    r.raw.auto_close = False
+    raw = io.BufferedReader(r.raw)
+    # Servers send .xml.gz both as gzip bodies and with Content-Encoding
+    if raw.peek(2)[:2] == _GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=raw)
+    return raw
+
+
+def iter_sitemap_entries(fileobj):
+    """
+    Stream ("url"|"sitemap", loc, lastmod) from a urlset or sitemapindex
+    document without holding the tree in memory.
+    """
+    context = ET.iterparse(fileobj, events=("start", "end"))
+    _, root = next(context)
+
+    for event, elem in context:
+        if event != "end":
+            continue
+
+        kind = _local(elem.tag)
+        if kind not in ("url", "sitemap"):
+            continue
+
+        loc = lastmod = None
+        for child in elem:
+            name = _local(child.tag)
+            if name == "loc":
+                loc = (child.text or "").strip()
+            elif name == "lastmod":
+                lastmod = parse_lastmod(child.text)
+
+        if loc:
+            yield kind, loc, lastmod
+
+        # Drop processed entries so memory stays flat on 50k-URL files
+        root.clear()
+
+
+def iter_sitemap(url, max_depth=3, _seen=None):
+    """
+    Yield (page_url, lastmod) from a sitemap, following sitemap index
+    files up to `max_depth` levels. Broken sitemaps are logged and
+    skipped.
+    """
+    seen = _seen if _seen is not None else set()
+    if url in seen:
+        return
+    seen.add(url)
+
+    try:
+        r = http_get(url, use_cache=False, stream=True)
+        r.raise_for_status()
+    except requests.RequestException as e:
+        logger.warning(f"[SITEMAP] Could not fetch {url}: {e}")
+        return
+
+    children = []
+    count = 0
+    try:
+        for kind, loc, lastmod in iter_sitemap_entries(_open_stream(r)):
+            if kind == "sitemap":
+                children.append(loc)
+            else:
+                count += 1
+                yield loc, lastmod
+    except (ET.ParseError, OSError, EOFError) as e:
+        logger.warning(f"[SITEMAP] Malformed sitemap {url}: {e}")
+    finally:
+        r.close()
+
+    logger.info(f"[SITEMAP] {url}: {count} URLs, {len(children)} child sitemaps")
+
+    if max_depth > 0:
+        for child in children:
+            yield from iter_sitemap(child, max_depth - 1, seen)
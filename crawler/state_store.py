@@ -0,0 +1,171 @@
+import json
+import os
+import sqlite3
+import time
+from urllib.parse import urlparse
+
+from config import CRAWL_STATE_DIR, CRAWL_STATE_BATCH, CRAWL_STATE_FLUSH_SECONDS
+from core.logger import logger
+from core.records import PageRecords
+
+QUEUED = "queued"
+DONE = "done"
+FAILED = "failed"
+
+
+class CrawlStateStore:
+    """
+    SQLite checkpoint of one crawl: run settings, every URL the frontier
+    accepted with its status, and the scraped page records.
+
+    Writes are buffered and committed in batches of `batch_size` (or every
+    `flush_seconds`), so checkpointing costs one transaction per batch
+    rather than one per URL. A crash loses at most the unflushed batch;
+    those URLs are simply crawled again on resume.
+    """
+
+    def __init__(self, path, batch_size=None, flush_seconds=None):
+        self.path = path
+        self.batch_size = batch_size or CRAWL_STATE_BATCH
+        self.flush_seconds = CRAWL_STATE_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                depth INTEGER NOT NULL,
+                priority REAL NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                error TEXT,
+                updated REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_urls_status ON urls(status, seq);
+            CREATE TABLE IF NOT EXISTS results (
+                url TEXT PRIMARY KEY,
+                page_data TEXT,
+                seq INTEGER NOT NULL
+            );
+        """)
+
+        row = self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM urls").fetchone()
+        self._seq = row[0]
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def for_new_crawl(cls, start_url):
+        host = urlparse(start_url).netloc.replace(":", "_") or "crawl"
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return cls(os.path.join(CRAWL_STATE_DIR, f"{host}-{stamp}.sqlite"))
+
+    # ── run settings ─────────────────────────
+    def set_meta(self, **values):
+        self._db.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+            [(k, json.dumps(v)) for k, v in values.items()]
+        )
+        self._db.commit()
+
+    def get_meta(self):
+        return {k: json.loads(v) for k, v in self._db.execute("SELECT key, value FROM meta")}
+
+    # ── buffered writes ──────────────────────
+    def _write(self, sql, params):
+        self._pending.append((sql, params))
+        if len(self._pending) >= self.batch_size \
+                or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            with self._db:   # one transaction per batch
+                for sql, params in self._pending:
+                    self._db.execute(sql, params)
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def enqueue(self, url, depth, priority=0):
+        self._seq += 1
+        self._write(
+            "INSERT OR IGNORE INTO urls (url, depth, priority, status, seq, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (url, depth, priority, QUEUED, self._seq, time.time())
+        )
+
+    @staticmethod
+    def _dump_page_data(page_data):
+        if page_data is None:
+            return None
+        if isinstance(page_data, PageRecords):
+            return json.dumps(page_data.to_columns())
+        return json.dumps(page_data)
+
+    @staticmethod
+    def _load_page_data(raw):
+        if raw is None:
+            return None
+        value = json.loads(raw)
+        # Columns dict → PageRecords; legacy list of dicts as-is
+        return PageRecords.from_columns(value) if isinstance(value, dict) else value
+
+    def complete(self, url, page_data=None):
+        self._seq += 1
+        self._write(
+            "UPDATE urls SET status = ?, error = NULL, updated = ? WHERE url = ?",
+            (DONE, time.time(), url)
+        )
+        self._write(
+            "INSERT OR REPLACE INTO results (url, page_data, seq) VALUES (?, ?, ?)",
+            (url, self._dump_page_data(page_data), self._seq)
+        )
+
+    def fail(self, url, error):
+        self._write(
+            "UPDATE urls SET status = ?, error = ?, updated = ? WHERE url = ?",
+            (FAILED, str(error)[:500], time.time(), url)
+        )
+
+    # ── resume ───────────────────────────────
+    def has_progress(self):
+        self.flush()
+        return self._db.execute("SELECT 1 FROM urls LIMIT 1").fetchone() is not None
+
+    def restore_frontier(self, frontier):
+        """Mark every known URL as seen and re-queue the unfinished ones."""
+        self.flush()
+        queued = 0
+        for url, depth, priority, status in self._db.execute(
+            "SELECT url, depth, priority, status FROM urls ORDER BY seq"
+        ):
+            if status == QUEUED:
+                frontier.restore(url, depth, priority)
+                queued += 1
+            else:
+                frontier.mark_seen(url)
+
+        logger.info(f"[CRAWL STATE] Restored {queued} queued URLs from {self.path}")
+        return queued
+
+    def completed_pages(self):
+        """Pages finished in earlier sessions, in completion order."""
+        self.flush()
+        for url, page_data in self._db.execute(
+            "SELECT url, page_data FROM results ORDER BY seq"
+        ):
+            yield {
+                "page_url": url,
+                "page_data": self._load_page_data(page_data),
+                "links": []
+            }
+
+    def close(self):
+        self.flush()
+        self._db.close()
@@ -0,0 +1,170 @@
+import json
+import os
+import queue
+import sqlite3
+import time
+import zlib
+from urllib.parse import urlparse
+
+from config import WORK_QUEUE_POLL_SECONDS
+
+
+def shard_for(url, shards, by="host"):
+    """
+    Stable URL → shard mapping (same answer in every process/machine).
+
+    by="host" keeps every host on one worker, so that worker's politeness
+    scheduler sees all of the host's traffic. by="url" spreads a single
+    site over all workers; each worker then paces the host on its own.
+    """
+    key = urlparse(url).netloc.lower() if by == "host" else url
+    return zlib.crc32(key.encode("utf-8")) % shards
+
+
+class InProcessQueue:
+    """
+    Work queue for workers running as threads of this process.
+
+    Same interface as SQLiteQueue: put_task/get_task per shard,
+    put_result/get_result towards the coordinator.
+    """
+
+    local_only = True
+
+    def __init__(self, shards):
+        self.shards = shards
+        self._tasks = [queue.Queue() for _ in range(shards)]
+        self._results = queue.Queue()
+
+    def put_task(self, shard, task):
+        self._tasks[shard].put(task)
+
+    def get_task(self, shard, timeout=None):
+        try:
+            return self._tasks[shard].get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def put_result(self, result):
+        self._results.put(result)
+
+    def get_result(self, timeout=None):
+        try:
+            return self._results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        pass
+
+
+class SQLiteQueue:
+    """
+    Work queue in a SQLite file, shared by worker processes on this
+    machine (or on other machines that see the same file).
+
+    Each process opens its own connection from `path`; a task is taken
+    (read + delete) inside an IMMEDIATE transaction, so it goes to
+    exactly one worker. Payloads are JSON.
+    """
+
+    local_only = False
+
+    def __init__(self, path, shards=None, reset=False, poll_seconds=None):
+        self.path = path
+        self.poll_seconds = WORK_QUEUE_POLL_SECONDS if poll_seconds is None else poll_seconds
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._db.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                shard INTEGER NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_shard ON tasks(shard, id);
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+
+        if reset:
+            self._db.execute("DELETE FROM tasks")
+            self._db.execute("DELETE FROM results")
+
+        if shards is not None:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('shards', ?)", (str(shards),))
+            self.shards = shards
+        else:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'shards'").fetchone()
+            self.shards = int(row[0]) if row else None
+
+    def _poll(self, fetch, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            item = fetch()
+            if item is not None:
+                return item
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_seconds)
+
+    def put_task(self, shard, task):
+        self._db.execute(
+            "INSERT INTO tasks (shard, payload) VALUES (?, ?)", (shard, json.dumps(task))
+        )
+
+    def _claim(self, shard):
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute(
+                "SELECT id, payload FROM tasks WHERE shard = ? ORDER BY id LIMIT 1",
+                (shard,)
+            ).fetchone()
+            if row is not None:
+                self._db.execute("DELETE FROM tasks WHERE id = ?", (row[0],))
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return json.loads(row[1]) if row else None
+
+    def get_task(self, shard, timeout=None):
+        return self._poll(lambda: self._claim(shard), timeout)
+
+    def put_result(self, result):
+        self._db.execute("INSERT INTO results (payload) VALUES (?)", (json.dumps(result),))
+
+    def _take_result(self):
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute("SELECT id, payload FROM results ORDER BY id LIMIT 1").fetchone()
+            if row is not None:
+                self._db.execute("DELETE FROM results WHERE id = ?", (row[0],))
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return json.loads(row[1]) if row else None
+
+    def get_result(self, timeout=None):
+        return self._poll(self._take_result, timeout)
+
+    def close(self):
+        self._db.close()
+
+
+def open_queue(backend, shards, path=None):
+    """WORK_QUEUE backend name → queue instance for the coordinator."""
+    if backend == "memory":
+        return InProcessQueue(shards)
+    if backend == "sqlite":
+        return SQLiteQueue(path, shards=shards, reset=True)
+    raise ValueError(f"Unknown work queue backend: {backend!r}")
@@ -1,4 +1,7 @@
 import csv
+import os
+
+from config import EXPORT_BATCH_SIZE
 
 # Used only when exporting generic scraped data
 FIELD_MAP = {
@@ -77,3 +80,94 @@ def export_csv(data, selected=None, filename="output.csv"):
         writer.writerows(rows)
 
     print(f"📄 Exported {len(rows)} rows to {filename}")
+
+
+# ─────────────────────────────
+# STREAMING CSV (fixed schema, O(1) memory)
+# ─────────────────────────────
+PAGE_CSV_FIELDS = ["page_url", "text", "videos", "image_count", "image_urls"]
+
+
+def flatten_page(page):
+    """Pipeline page dict → one flat PAGE_CSV_FIELDS row."""
+    content = page.get("content")
+    if isinstance(content, dict):
+        text = content.get("text") or ""
+        videos = content.get("videos", [])
+    else:
+        text = content or ""
+        videos = []
+
+    return {
+        "page_url": page.get("page_url", ""),
+        "text": text,
+        "videos": " | ".join(videos),
+        "image_count": page.get("image_count", 0),
+        "image_urls": " | ".join(page.get("image_urls", []))
+    }
+
+
+class CsvStreamExporter:
+    """
+    CSV writer with a schema fixed up front, so rows can be written one
+    at a time instead of scanning the whole dataset for headers.
+
+    Rows are flushed every `batch_size` writes. With `append=True` an
+    existing file is continued and the header is only written for a new
+    or empty file. Unknown keys are ignored, missing ones left blank.
+    """
+
+    def __init__(self, fieldnames, filename="output.csv", append=False,
+                 batch_size=None, output_dir="output"):
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, filename)
+        self.batch_size = batch_size or EXPORT_BATCH_SIZE
+
+        has_content = append and os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+        self._fh = open(self.path, "a" if append else "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(
+            self._fh,
+            fieldnames=fieldnames,
+            extrasaction="ignore",
+            restval=""
+        )
+        if not has_content:
+            self._writer.writeheader()
+
+        self._unflushed = 0
+        self.written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, row):
+        self._writer.writerow(row)
+        self.written += 1
+        self._unflushed += 1
+        if self._unflushed >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self._fh.flush()
+        self._unflushed = 0
+
+    def close(self):
+        if self._fh is None:
+            return
+        self.flush()
+        self._fh.close()
+        self._fh = None
+
+
+def export_csv_stream(pages, filename="output.csv", append=False):
+    """Stream pipeline pages to CSV (PAGE_CSV_FIELDS); returns the row count."""
+    with CsvStreamExporter(PAGE_CSV_FIELDS, filename, append=append) as exporter:
+        for page in pages:
+            exporter.write(flatten_page(page))
+
+    print(f"📄 Exported {exporter.written} rows to {exporter.path}")
+    return exporter.written
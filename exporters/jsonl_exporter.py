@@ -0,0 +1,95 @@
+import gzip
+import json
+import os
+
+from config import EXPORT_BATCH_SIZE
+
+COMPRESSION_SUFFIX = {
+    "gzip": ".gz",
+    "zstd": ".zst"
+}
+
+
+def _open_compressed(path, compression, append):
+    mode = "ab" if append else "wb"
+
+    if compression == "gzip":
+        # Appending adds a new gzip member; readers see one stream
+        return gzip.open(path, mode)
+
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd export needs the 'zstandard' package (pip install zstandard)")
+
+        raw = open(path, mode)
+        # Appending adds a new zstd frame; multi-frame files decode as one
+        return zstandard.ZstdCompressor(level=6).stream_writer(raw, closefd=True)
+
+    return open(path, mode)
+
+
+class JsonlExporter:
+    """
+    One JSON object per line, written as records arrive.
+
+    Records are buffered and flushed every `batch_size` writes, so a file
+    being written by a running crawl is always readable up to the last
+    flushed batch. `append=True` continues an existing file (also for
+    gzip/zstd, which concatenate members/frames).
+    """
+
+    def __init__(self, filename="output.jsonl", compression=None, append=False,
+                 batch_size=None, output_dir="output"):
+        if compression and not filename.endswith(COMPRESSION_SUFFIX[compression]):
+            filename += COMPRESSION_SUFFIX[compression]
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, filename)
+        self.compression = compression
+        self.batch_size = batch_size or EXPORT_BATCH_SIZE
+
+        self._fh = _open_compressed(self.path, compression, append)
+        self._buffer = []
+        self.written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, record):
+        self._buffer.append(json.dumps(record, ensure_ascii=False, default=str))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._fh.write(("\n".join(self._buffer) + "\n").encode("utf-8"))
+            self.written += len(self._buffer)
+            self._buffer = []
+
+        if self.compression == "zstd":
+            import zstandard
+            self._fh.flush(zstandard.FLUSH_BLOCK)
+        else:
+            self._fh.flush()
+
+    def close(self):
+        if self._fh is None:
+            return
+        self.flush()
+        self._fh.close()
+        self._fh = None
+
+
+def export_jsonl(records, filename="output.jsonl", compression=None, append=False):
+    """Stream any iterable of dicts to JSON Lines; returns the record count."""
+    with JsonlExporter(filename, compression=compression, append=append) as exporter:
+        for record in records:
+            exporter.write(record)
+
+    print(f"📄 Exported {exporter.written} records to {exporter.path}")
+    return exporter.written
@@ -1,10 +1,16 @@
 import os
 
 def export_txt(pages, filename="output.txt"):
+    """
+    Write pages as they arrive. `pages` may be any iterable (including a
+    generator), so output appears while a crawl is still running and
+    nothing is held in memory. Returns the number of pages written.
+    """
     output_dir = "output"
     os.makedirs(output_dir, exist_ok=True)
 
     file_path = os.path.join(output_dir, filename)
+    written = 0
 
     with open(file_path, "w", encoding="utf-8") as f:
         for i, page in enumerate(pages, 1):
@@ -57,5 +63,8 @@ def export_txt(pages, filename="output.txt"):
                 f.write("No videos found.\n")
 
             f.write("\n\n")
+            f.flush()   # 📤 page is readable on disk right away
+            written = i
 
     print(f"📄 Saved TXT output to {file_path}")
+    return written
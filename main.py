@@ -1,21 +1,35 @@
-import time
+import argparse
+from urllib.parse import urlparse
+
+import requests
+
 from core.logger import logger
 
 from core.utils import (
     analyze_page_structure,
     ask_user_choice,
-    content_score
+    content_score,
+    filter_fields
 )
 
-from scrapers.api_scraper import scrape_via_api
-from scrapers.static_scraper import scrape_static
-from scrapers.dynamic_scraper import scrape_dynamic
+from scrapers.api_scraper import scrape_via_api, iter_api_records
+from scrapers.static_scraper import scrape_static, scrape_static_many
+from scrapers.dynamic_scraper import scrape_dynamic, scrape_dynamic_many
 
-from processing.content_extractor import extract_meaningful_content
+from core.render_cache import get_render_strategy, save_render_strategy
+
+from processing.pipeline import enhance_pages, extract_pages, with_data
+from processing.boilerplate import BoilerplateIndex
+from processing.dedup import NearDuplicateIndex, skip_near_duplicates
 from exporters.txt_exporter import export_txt
+from exporters.jsonl_exporter import export_jsonl
+from exporters.exporter import export_csv_stream
 
-from crawler.crawler import crawl_site
-from crawler.crawler_browser import crawl_site_browser
+from crawler.crawler import crawl_site, crawl_and_scrape
+from crawler.crawler_browser import crawl_site_browser, crawl_and_scrape_browser
+from crawler.state_store import CrawlStateStore
+from crawler.discovery import SiteDiscovery
+from crawler.distributed import distributed_crawl, serve_shard
 
 # ✅ IMPORT ALL CONFIG VARIABLES
 from config import (
@@ -24,34 +38,55 @@ from config import (
     DOMINANCE_RATIO,
     REQUEST_TIMEOUT,
     HEADLESS,
-    FIELD_MAP
+    FIELD_MAP,
+    FUSED_CRAWL,
+    RENDER_REFRESH,
+    CRAWL_STATE_ENABLED,
+    EXPORT_FORMAT,
+    EXPORT_COMPRESSION,
+    EXPORT_APPEND,
+    BOILERPLATE_ENABLED,
+    DEDUP_ENABLED,
+    DEDUP_PERSIST,
+    DEDUP_DB,
+    CRAWL_DISCOVERY,
+    DISTRIBUTED_WORKERS,
+    WORK_QUEUE_PATH
 )
 
-# 🖼️ IMAGE EXTRACTION (ONLY <img>)
-def extract_image_info(page_data):
-    images = []
-
-    for d in page_data:
-        if d.get("tag") == "img" and d.get("src"):
-            images.append(d["src"])
 
-    images = list(dict.fromkeys(images))
-    return {
-        "image_count": len(images),
-        "image_urls": images[:10]
-    }
+def choose_best_render(url, refresh=False):
+    if not refresh:
+        cached = get_render_strategy(url)
+        if cached:
+            logger.info(
+                f"Reusing cached {cached['mode']} render for {url} "
+                f"(static={cached['static_score']}, dynamic={cached['dynamic_score']})"
+            )
+            try:
+                data = scrape_static(url) if cached["mode"] == "STATIC" else scrape_dynamic(url)
+            except requests.RequestException as e:
+                logger.warning(f"Cached render failed for {url}: {e}")
+                data = None
+            if data:
+                return data, cached["mode"]
+            logger.info("Cached render returned no data, re-evaluating")
 
-
-def choose_best_render(url):
     logger.info(f"Evaluating best render strategy for {url}")
 
-    static_data = scrape_static(url)
+    try:
+        static_data = scrape_static(url)
+    except requests.RequestException as e:
+        # Retries exhausted: let the browser have a go instead of aborting
+        logger.warning(f"Static fetch failed for {url}: {e}")
+        static_data = []
     static_score = content_score(static_data)
 
     logger.info(f"Static score: {static_score}")
 
     if static_score >= STATIC_SCORE_THRESHOLD:
         logger.info("Static render selected")
+        save_render_strategy(url, "STATIC", static_score)
         return static_data, "STATIC"
 
     dynamic_data = scrape_dynamic(url)
@@ -61,107 +96,224 @@ def choose_best_render(url):
 
     if dynamic_score > static_score * DOMINANCE_RATIO:
         logger.info("Dynamic render selected")
+        save_render_strategy(url, "DYNAMIC", static_score, dynamic_score)
         return dynamic_data, "DYNAMIC"
 
     logger.info("Fallback to static render")
+    save_render_strategy(url, "STATIC", static_score, dynamic_score)
     return static_data, "STATIC"
 
 
-def run():
-    url = input("🌐 Enter website URL: ").strip()
-    logger.info(f"Scraping started for URL: {url}")
-
-    logger.info("Checking for public API")
-    api_preview, api_endpoint = scrape_via_api(url, preview=True)
-
-    # ✅ API PATH
-    if api_preview:
-        print("✅ API detected")
-        logger.info(f"API detected at endpoint: {api_endpoint}")
-
-        api_data, _ = scrape_via_api(url)
-
-        export_txt([{
-            "page_url": url,
-            "content": {
-                "text": str(api_data),
-                "videos": []
-            },
-            "image_count": 0,
-            "image_urls": []
-        }])
-
-        print("✅ Done (API-based)")
-        logger.info("API-based scraping completed successfully")
-        return
-
-    print("❌ No API found. Using HTML rendering.")
-    logger.info("No API found, switching to HTML scraping")
-
-    raw_data, site_type = choose_best_render(url)
-    print(f"🔍 Using {site_type} render")
-    logger.info(f"Render mode selected: {site_type}")
-
-    scrape_options = analyze_page_structure(raw_data)
-    selected = ask_user_choice(scrape_options)
-    internal_fields = [FIELD_MAP[s] for s in selected if s in FIELD_MAP]
+def export_pages(pages):
+    """Stream pages to the configured EXPORT_FORMAT; returns pages written."""
+    if EXPORT_FORMAT == "jsonl":
+        return export_jsonl(pages, compression=EXPORT_COMPRESSION, append=EXPORT_APPEND)
+    if EXPORT_FORMAT == "csv":
+        return export_csv_stream(pages, append=EXPORT_APPEND)
+    return export_txt(pages)
 
-    logger.info(f"User selected scrape fields: {selected}")
 
-    crawl = input(f"🕷️ Crawl up to {MAX_PAGES} pages? (y/N): ").lower() == "y"
-    logger.info(f"Crawling enabled: {crawl}")
-
-    if crawl:
-        urls = (
-            crawl_site(url, MAX_PAGES)
+def crawl_pages(url, site_type, internal_fields, max_pages, state=None, discovery=None):
+    """Yield {"page_url", "page_data"} for every crawled page."""
+    if FUSED_CRAWL:
+        # 🕷️ Single pass: the crawler hands back parsed records per page
+        yield from (
+            crawl_and_scrape(url, max_pages, internal_fields, state=state, discovery=discovery)
             if site_type == "STATIC"
-            else crawl_site_browser(url, MAX_PAGES)
+            else crawl_and_scrape_browser(
+                url, max_pages, internal_fields, state=state, discovery=discovery
+            )
         )
-    else:
-        urls = [url]
+        return
 
+    urls = (
+        crawl_site(url, max_pages, state=state, discovery=discovery)
+        if site_type == "STATIC"
+        else crawl_site_browser(url, max_pages, state=state, discovery=discovery)
+    )
     logger.info(f"Total URLs to scrape: {len(urls)}")
 
-    scraped_pages = []
-
-    for i, page_url in enumerate(urls, 1):
-        print(f"🔍 [{i}/{len(urls)}] {page_url}")
-        logger.info(f"Scraping page {i}/{len(urls)}: {page_url}")
-
-        data = (
-            scrape_static(page_url, internal_fields)
-            if site_type == "STATIC"
-            else scrape_dynamic(page_url, internal_fields)
-        )
+    # ♻️ On resume, pages scraped in an earlier session are replayed
+    done = {}
+    if state is not None:
+        done = {
+            p["page_url"]: p["page_data"]
+            for p in state.completed_pages()
+            if p["page_data"]
+        }
+    for page_url in urls:
+        if page_url in done:
+            yield {"page_url": page_url, "page_data": done[page_url]}
+
+    todo = [u for u in urls if u not in done]
+
+    # ⚡ Concurrent fetches (static) / parallel renders on the browser pool
+    pages = (
+        scrape_static_many(todo, internal_fields)
+        if site_type == "STATIC"
+        else scrape_dynamic_many(todo, internal_fields)
+    )
+    for page in pages:
+        if state is not None and page["page_data"]:
+            state.complete(page["page_url"], page["page_data"])
+        yield page
+
+
+def run(resume=None):
+    state = None
+    dedup = None
+    discovery = None
+
+    if resume:
+        state = CrawlStateStore(resume)
+        meta = state.get_meta()
+        url = meta["start_url"]
+        site_type = meta["site_type"]
+        internal_fields = meta["fields"]
+        # The budget is part of the crawl: don't let a changed MAX_PAGES stretch it
+        max_pages = meta.get("max_pages", MAX_PAGES)
+        crawl = True
+
+        print(f"♻️ Resuming {site_type} crawl of {url} from {resume}")
+        logger.info(f"Resuming crawl from checkpoint {resume}")
 
-        if data:
-            scraped_pages.append({
-                "page_url": page_url,
-                "page_data": data
-            })
-            logger.info(f"Data extracted from {page_url}")
+    else:
+        max_pages = MAX_PAGES
+        url = input("🌐 Enter website URL: ").strip()
+        logger.info(f"Scraping started for URL: {url}")
+
+        logger.info("Checking for public API")
+        api_preview, api_endpoint = scrape_via_api(url, preview=True)
+
+        # ✅ API PATH
+        if api_preview:
+            print("✅ API detected")
+            logger.info(f"API detected at endpoint: {api_endpoint}")
+
+            # 📚 Every page of the endpoint, streamed record by record
+            saved = export_jsonl(
+                iter_api_records(url),
+                filename="api_records.jsonl",
+                compression=EXPORT_COMPRESSION,
+                append=EXPORT_APPEND
+            )
+
+            print(f"✅ Done (API-based). Saved {saved} records")
+            logger.info(f"API-based scraping completed successfully. Records saved: {saved}")
+            return
+
+        print("❌ No API found. Using HTML rendering.")
+        logger.info("No API found, switching to HTML scraping")
+
+        raw_data, site_type = choose_best_render(url, refresh=RENDER_REFRESH)
+        print(f"🔍 Using {site_type} render")
+        logger.info(f"Render mode selected: {site_type}")
+
+        scrape_options = analyze_page_structure(raw_data)
+        selected = ask_user_choice(scrape_options)
+        internal_fields = [FIELD_MAP[s] for s in selected if s in FIELD_MAP]
+
+        logger.info(f"User selected scrape fields: {selected}")
+
+        crawl = input(f"🕷️ Crawl up to {max_pages} pages? (y/N): ").lower() == "y"
+        logger.info(f"Crawling enabled: {crawl}")
+
+        if crawl and CRAWL_STATE_ENABLED and not DISTRIBUTED_WORKERS:
+            state = CrawlStateStore.for_new_crawl(url)
+            state.set_meta(
+                start_url=url,
+                site_type=site_type,
+                fields=internal_fields,
+                max_pages=max_pages
+            )
+            print(f"💾 Checkpointing to {state.path} (continue with --resume {state.path})")
+
+    # 🌊 Streaming pipeline: fetch → parse → extract → export, page by page
+    try:
+        if crawl and CRAWL_DISCOVERY == "sitemap":
+            # 🗺️ robots.txt rules + sitemap seeding instead of link BFS alone
+            discovery = SiteDiscovery(url)
+
+        if crawl and DEDUP_ENABLED:
+            # 🧬 Near-duplicates (by extracted text) never reach the LLM or export
+            dedup = NearDuplicateIndex(
+                persist_path=DEDUP_DB if DEDUP_PERSIST else None,
+                host=urlparse(url).netloc
+            )
+
+        boilerplate = BoilerplateIndex() if crawl and BOILERPLATE_ENABLED else None
+
+        if crawl and DISTRIBUTED_WORKERS and state is None:
+            # 🧩 Host-sharded workers scrape + extract; pages come back export-ready
+            if boilerplate is not None:
+                logger.warning(
+                    "Boilerplate stripping is not applied to distributed crawls "
+                    "(each worker extracts its pages on its own)"
+                )
+            pages = distributed_crawl(
+                url, max_pages, site_type, internal_fields, discovery=discovery
+            )
+            if dedup is not None:
+                pages = skip_near_duplicates(pages, dedup)
+            saved = export_pages(enhance_pages(pages))
         else:
-            logger.warning(f"No data extracted from {page_url}")
-
-        time.sleep(0.5)  # polite crawling
-
-    final_pages = []
-
-    for page in scraped_pages:
-        content = extract_meaningful_content(page["page_data"], page["page_url"])
-        image_info = extract_image_info(page["page_data"])
-
-        final_pages.append({
-            "page_url": page["page_url"],
-            "content": content,   # ✅ contains {text, videos}
-            "image_count": image_info["image_count"],
-            "image_urls": image_info["image_urls"]
-        })
-
-    export_txt(final_pages)
-    print("✅ Done. Saved to output.txt")
-    logger.info(f"Scraping completed successfully. Pages saved: {len(final_pages)}")
+            if crawl:
+                pages = with_data(
+                    crawl_pages(url, site_type, internal_fields, max_pages, state, discovery),
+                    max_pages
+                )
+            else:
+                # ♻️ Reuse the render choose_best_render already fetched
+                pages = with_data([{
+                    "page_url": url,
+                    "page_data": filter_fields(raw_data, internal_fields)
+                }], 1)
+
+            saved = export_pages(extract_pages(pages, boilerplate=boilerplate, dedup=dedup))
+    finally:
+        # 💾 Whatever happened, keep the checkpoint consistent for --resume
+        if state is not None:
+            state.close()
+        if discovery is not None:
+            discovery.close()
+        if dedup is not None:
+            dedup.close()
+            if dedup.duplicates:
+                logger.info(f"Skipped {dedup.duplicates} near-duplicate pages")
+
+    _done(saved)
+
+
+def _done(saved):
+    print(f"✅ Done. Saved {saved} pages ({EXPORT_FORMAT})")
+    logger.info(f"Scraping completed successfully. Pages saved: {saved}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Universal website scraper")
+    parser.add_argument(
+        "--resume",
+        metavar="STATE_FILE",
+        help="continue an interrupted crawl from its checkpoint (.sqlite) file"
+    )
+    parser.add_argument(
+        "--worker",
+        metavar="SHARD",
+        type=int,
+        help="run as a crawl worker serving SHARD of a distributed crawl's work queue"
+    )
+    parser.add_argument(
+        "--queue",
+        metavar="QUEUE_FILE",
+        default=WORK_QUEUE_PATH,
+        help="work queue (.sqlite) shared with the coordinator (default: %(default)s)"
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    run()
+    args = parse_args()
+    if args.worker is not None:
+        serve_shard(args.queue, args.worker)
+    else:
+        run(resume=args.resume)
@@ -0,0 +1,57 @@
+import hashlib
+import re
+import threading
+from collections import defaultdict
+
+from config import BOILERPLATE_THRESHOLD, BOILERPLATE_MIN_PAGES
+
+_WS = re.compile(r"\s+")
+
+
+def block_hash(text):
+    """Stable 64-bit hash of a text block, ignoring case and whitespace runs."""
+    normalized = _WS.sub(" ", text).strip().lower()
+    return int.from_bytes(
+        hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest(),
+        "little"
+    )
+
+
+class BoilerplateIndex:
+    """
+    Counts on how many pages of a crawl each text block appears.
+
+    Blocks seen on at least `threshold` of the pages (once `min_pages`
+    pages have been observed) are treated as site template — headers,
+    nav menus, footers — and stripped. Only 8-byte hashes are kept, so
+    the index stays small for long crawls. Built incrementally, so the
+    first few pages of a crawl are not filtered.
+    """
+
+    def __init__(self, threshold=None, min_pages=None):
+        self.threshold = BOILERPLATE_THRESHOLD if threshold is None else threshold
+        self.min_pages = BOILERPLATE_MIN_PAGES if min_pages is None else min_pages
+
+        self.pages = 0
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def observe(self, blocks):
+        """Record one page's blocks; returns their hashes."""
+        hashes = {block_hash(b) for b in blocks}
+        with self._lock:
+            self.pages += 1
+            for h in hashes:
+                self._counts[h] += 1
+        return hashes
+
+    def is_boilerplate(self, block, h=None):
+        if self.pages < self.min_pages:
+            return False
+        h = block_hash(block) if h is None else h
+        return self._counts.get(h, 0) / self.pages >= self.threshold
+
+    def strip(self, blocks):
+        """observe() the page, then return the blocks that are not boilerplate."""
+        self.observe(blocks)
+        return [b for b in blocks if not self.is_boilerplate(b)]
@@ -1,10 +1,14 @@
-from typing import List, Dict
+import re
+from typing import List, Dict, Optional, Union
 from collections import Counter
 from urllib.parse import urljoin
 
+from core.records import PageRecords, as_page_records
+
 # ✅ LLM AUTO-SWITCH IMPORTS (NEW)
 from core.utils import enhance_with_openai, LLM_ENABLED
 from core.logger import logger
+from processing.boilerplate import BoilerplateIndex
 
 MIN_TEXT_LENGTH = 40
 
@@ -13,25 +17,43 @@ JUNK_KEYWORDS = [
     "login", "register", "copyright", "all rights reserved"
 ]
 
+# One pass over the text instead of one substring scan per keyword
+JUNK_PATTERN = re.compile("|".join(re.escape(k) for k in JUNK_KEYWORDS))
+
 VIDEO_EXTENSIONS = (".mp4", ".webm", ".ogg", ".m3u8")
 
 
-def extract_meaningful_content(page_data: List[dict], base_url: str) -> Dict:
+# 🖼️ IMAGE EXTRACTION (ONLY <img>)
+def extract_image_info(page_data):
+    records = as_page_records(page_data)
+    images = []
+
+    for tag, src in zip(records.tags, records.srcs):
+        if tag == "img" and src:
+            images.append(src)
+
+    images = list(dict.fromkeys(images))
+    return {
+        "image_count": len(images),
+        "image_urls": images[:10]
+    }
+
+
+def extract_meaningful_content(
+    page_data: Union[PageRecords, List[dict]],
+    base_url: str,
+    boilerplate: Optional[BoilerplateIndex] = None,
+    enhance: bool = True
+) -> Dict:
+    records = as_page_records(page_data)
     texts = []
     videos = []
 
-    raw_texts = [
-        d.get("text", "").strip()
-        for d in page_data
-        if d.get("text")
-    ]
+    raw_texts = [t.strip() for t in records.texts if t]
     freq = Counter(raw_texts)
 
-    for d in page_data:
-        tag = (d.get("tag") or "").lower()
-        text = d.get("text", "")
-        src = d.get("src")
-        href = d.get("href")
+    for tag, text, href, src in records.rows():
+        tag = (tag or "").lower()
 
         # 🎥 VIDEO EXTRACTION (SAFE & ABSOLUTE URLs)
         if tag in ("video", "source") and src:
@@ -51,7 +73,7 @@ def extract_meaningful_content(page_data: List[dict], base_url: str) -> Dict:
         text = text.strip()
         lowered = text.lower()
 
-        if any(j in lowered for j in JUNK_KEYWORDS):
+        if JUNK_PATTERN.search(lowered):
             continue
 
         if len(text) < MIN_TEXT_LENGTH:
@@ -65,15 +87,20 @@ def extract_meaningful_content(page_data: List[dict], base_url: str) -> Dict:
 
     unique_texts = list(dict.fromkeys(texts))
 
+    # 🧱 SITE TEMPLATE REMOVAL (blocks repeated across the crawl)
+    if boilerplate is not None:
+        unique_texts = boilerplate.strip(unique_texts)
+
     # ─────────────────────────────────────────
     # 🧠 AUTO LLM SWITCH (ONLY CHANGE)
     # ─────────────────────────────────────────
     final_text = "\n\n".join(unique_texts)
 
-    if LLM_ENABLED:
+    # enhance=False: the caller runs enhancement as its own stage
+    if LLM_ENABLED and enhance:
         logger.info("🧠 LLM enhancement enabled")
         final_text = enhance_with_openai(final_text)
-    else:
+    elif not LLM_ENABLED:
         logger.info("⚙️ LLM not available, using rule-based text")
 
     return {
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections import defaultdict
+from urllib.parse import urlparse
+
+from config import DEDUP_MAX_DISTANCE
+from core.logger import logger
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+SHINGLE_SIZE = 3
+_BITS = 64
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash(text):
+    """64-bit SimHash over word 3-shingles; None when there is too little text."""
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return None
+
+    features = {
+        " ".join(words[i:i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+    counts = [0] * _BITS
+    for feature in features:
+        h = _feature_hash(feature)
+        for bit in range(_BITS):
+            counts[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, c in enumerate(counts):
+        if c > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def page_fingerprint(page, boilerplate=None):
+    """
+    SimHash of an extracted page's text (junk lines already dropped).
+
+    The raw records would let a shared nav/footer/sidebar dominate the
+    shingles of short pages; with a BoilerplateIndex, template blocks it
+    has learned since the page was built are dropped as well.
+    """
+    blocks = page["content"]["text"].split("\n\n")
+    if boilerplate is not None:
+        blocks = [b for b in blocks if not boilerplate.is_boilerplate(b)]
+    return simhash(" ".join(blocks))
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateIndex:
+    """
+    Finds pages whose SimHash is within `max_distance` bits of one seen
+    before.
+
+    Fingerprints are split into max_distance + 1 bands; two fingerprints
+    within the distance share at least one identical band (pigeonhole),
+    so a lookup only compares against pages in matching band buckets.
+    With `persist_path`, fingerprints are stored in SQLite and pages
+    from earlier runs on the same host are matched as well (a page never
+    counts as a duplicate of its own URL).
+    """
+
+    def __init__(self, max_distance=None, persist_path=None, host=None):
+        self.max_distance = DEDUP_MAX_DISTANCE if max_distance is None else max_distance
+        self.bands = self.max_distance + 1
+        self.band_bits = _BITS // self.bands
+
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+        self._db = None
+        if persist_path:
+            os.makedirs(os.path.dirname(persist_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(persist_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints ("
+                "url TEXT PRIMARY KEY, host TEXT NOT NULL, fingerprint TEXT NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_fp_host ON fingerprints(host)")
+            self._load(host)
+
+    def _band_keys(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(fingerprint >> (i * self.band_bits)) & mask for i in range(self.bands)]
+
+    def _insert(self, url, fingerprint):
+        for i, key in enumerate(self._band_keys(fingerprint)):
+            self._buckets[i][key].append((fingerprint, url))
+
+    def _load(self, host):
+        rows = self._db.execute(
+            "SELECT url, fingerprint FROM fingerprints WHERE host = ?", (host or "",)
+        ).fetchall()
+        for url, fp in rows:
+            self._insert(url, int(fp, 16))
+        if rows:
+            logger.info(f"[DEDUP] Loaded {len(rows)} fingerprints from earlier runs")
+
+    def find(self, url, fingerprint):
+        """URL of a near-duplicate already indexed, or None."""
+        for i, key in enumerate(self._band_keys(fingerprint)):
+            for other, other_url in self._buckets[i].get(key, ()):
+                if other_url != url and hamming(fingerprint, other) <= self.max_distance:
+                    return other_url
+        return None
+
+    def check_and_add(self, url, fingerprint):
+        """Return the URL this page duplicates, or index it and return None."""
+        if fingerprint is None:
+            return None
+
+        with self._lock:
+            original = self.find(url, fingerprint)
+            if original is not None:
+                self.duplicates += 1
+                return original
+
+            self._insert(url, fingerprint)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?)",
+                    (url, urlparse(url).netloc, format(fingerprint, "016x"))
+                )
+                self._db.commit()
+        return None
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def skip_near_duplicates(pages, index, boilerplate=None):
+    """
+    Pipeline stage over built pages: drop those that near-duplicate an
+    earlier page.
+
+    With a BoilerplateIndex, the first pages are held back until it has
+    seen enough pages to know the template; fingerprinted earlier, their
+    nav/sidebar text would still count.
+    """
+    held = []
+
+    def check(page):
+        original = index.check_and_add(page["page_url"], page_fingerprint(page, boilerplate))
+        if original is not None:
+            logger.info(f"[DEDUP] Skipping {page['page_url']} (near-duplicate of {original})")
+            return False
+        return True
+
+    for page in pages:
+        if boilerplate is not None and boilerplate.pages < boilerplate.min_pages:
+            held.append(page)
+            continue
+        while held:
+            first = held.pop(0)
+            if check(first):
+                yield first
+        if check(page):
+            yield page
+
+    for page in held:
+        if check(page):
+            yield page
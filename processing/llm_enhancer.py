@@ -0,0 +1,192 @@
+import atexit
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    LLM_MODEL,
+    LLM_CONCURRENCY,
+    LLM_RPM,
+    LLM_TPM,
+    LLM_CHUNK_CHARS,
+    LLM_CACHE_DIR
+)
+from core.logger import logger
+from core.rate_limit import TokenBucket
+from core.utils import client, LLM_ENABLED
+
+# Bump whenever SYSTEM_PROMPT / build_prompt change, so cached output is not reused
+PROMPT_VERSION = "v1"
+
+SYSTEM_PROMPT = "You refine scraped web content without altering meaning."
+
+MIN_ENHANCE_LENGTH = 50
+
+
+def build_prompt(text):
+    return f"""
+You are refining website text.
+
+STRICT RULES:
+- DO NOT add new information
+- DO NOT remove factual content
+- DO NOT hallucinate
+- DO NOT mention scraping or AI
+- Remove navigation, cookies, footers
+- Improve clarity and readability
+- Preserve original meaning
+- Use clean paragraphs
+
+TEXT:
+{text}
+"""
+
+
+def chunk_text(text, max_chars=None):
+    """Split on paragraph boundaries into pieces of at most `max_chars`."""
+    max_chars = max_chars or LLM_CHUNK_CHARS
+    chunks, current = [], ""
+
+    for para in text.split("\n\n"):
+        # A single oversized paragraph is hard-split
+        while len(para) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(para[:max_chars])
+            para = para[max_chars:]
+
+        candidate = f"{current}\n\n{para}" if current else para
+        if len(candidate) > max_chars:
+            chunks.append(current)
+            current = para
+        else:
+            current = candidate
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _estimate_tokens(prompt):
+    # ~4 chars per token; reserve the same again for the completion
+    return max(1, len(prompt) // 4) * 2
+
+
+class LLMEnhancer:
+    """
+    Concurrent, cached and rate-limited wrapper around the chat API.
+
+    - chunks long texts (LLM_CHUNK_CHARS) instead of truncating them
+    - runs up to LLM_CONCURRENCY requests at once
+    - stays under LLM_RPM requests and LLM_TPM tokens per minute
+    - caches each chunk's result on disk keyed by prompt version, model
+      and content hash, so reruns over unchanged pages make no calls
+    Any API failure falls back to the original chunk text.
+    """
+
+    def __init__(self, client, model=None, concurrency=None, rpm=None, tpm=None,
+                 chunk_chars=None, cache_dir=None):
+        self.client = client
+        self.model = model or LLM_MODEL
+        self.chunk_chars = chunk_chars or LLM_CHUNK_CHARS
+        self.cache_dir = cache_dir or LLM_CACHE_DIR
+
+        rpm = rpm or LLM_RPM
+        tpm = tpm or LLM_TPM
+        self._requests = TokenBucket(rpm / 60, capacity=max(1, rpm // 6))
+        self._tokens = TokenBucket(tpm / 60, capacity=max(1, tpm // 6))
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency or LLM_CONCURRENCY,
+            thread_name_prefix="llm"
+        )
+
+        self.calls = 0
+        self.cache_hits = 0
+        self._stats_lock = threading.Lock()
+
+    # ── disk cache ───────────────────────────
+    def _cache_path(self, chunk):
+        key = hashlib.sha256(
+            f"{PROMPT_VERSION}\0{self.model}\0{chunk}".encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + ".txt")
+
+    def _cache_get(self, chunk):
+        try:
+            with open(self._cache_path(chunk), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _cache_put(self, chunk, result):
+        path = self._cache_path(chunk)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(result)
+        os.replace(tmp, path)
+
+    # ── API ──────────────────────────────────
+    def _enhance_chunk(self, chunk):
+        cached = self._cache_get(chunk)
+        if cached is not None:
+            with self._stats_lock:
+                self.cache_hits += 1
+            return cached
+
+        prompt = build_prompt(chunk)
+        self._requests.acquire(1)
+        self._tokens.acquire(_estimate_tokens(prompt))
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.2
+            )
+            result = response.choices[0].message.content.strip()
+        except Exception as e:
+            # 🔒 Absolute fallback — NEVER break scraper (and don't cache it)
+            logger.warning(f"[LLM] Enhancement failed, keeping original text: {e}")
+            return chunk
+
+        with self._stats_lock:
+            self.calls += 1
+        self._cache_put(chunk, result)
+        return result
+
+    def enhance(self, text):
+        if not text or len(text.strip()) < MIN_ENHANCE_LENGTH:
+            return text
+
+        chunks = chunk_text(text, self.chunk_chars)
+        results = self._executor.map(self._enhance_chunk, chunks)
+        return "\n\n".join(results)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        logger.info(f"[LLM] calls={self.calls} cache_hits={self.cache_hits}")
+
+
+_enhancer = None
+_enhancer_lock = threading.Lock()
+
+
+def get_enhancer():
+    """Shared LLMEnhancer, or None when no API key is configured."""
+    global _enhancer
+    if not LLM_ENABLED:
+        return None
+
+    if _enhancer is None:
+        with _enhancer_lock:
+            if _enhancer is None:
+                _enhancer = LLMEnhancer(client)
+                atexit.register(_enhancer.close)
+    return _enhancer
@@ -0,0 +1,107 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from config import PARSE_PROCESSES
+from core.logger import logger
+from core.records import PageRecords, as_page_records
+from core.utils import filter_fields
+from scrapers.html_parser import parse_html
+
+
+def _warm():
+    # Runs once per worker process: pay the imports before the first page
+    import processing.pipeline  # noqa: F401
+
+
+def _parse(content, records):
+    data, hrefs = parse_html(content, records=records)
+    # Plain lists pickle smaller and faster than Element-bearing objects
+    return (data.to_columns() if data is not None else None), hrefs
+
+
+def _parse_and_build(content, page_url, fields):
+    from processing.pipeline import build_page
+
+    data, hrefs = parse_html(content)
+    data = filter_fields(data, fields)
+    page = build_page({"page_url": page_url, "page_data": data}, enhance=False) if data else None
+    return data.to_columns(), hrefs, page
+
+
+def _build(page_url, columns):
+    # Imported late: processing.pipeline itself imports this module
+    from processing.pipeline import build_page
+
+    return build_page(
+        {"page_url": page_url, "page_data": PageRecords.from_columns(columns)},
+        enhance=False
+    )
+
+
+class ParsePool:
+    """
+    Warm ProcessPoolExecutor for the CPU-bound steps: HTML parsing
+    (raw bytes in, record columns + hrefs out) and rule-based extraction.
+
+    Workers are spawned once and reused for the whole run, so fetch
+    threads only hand over bytes and block on a future, which keeps the
+    GIL free for network I/O.
+    """
+
+    def __init__(self, processes=None):
+        self.processes = processes or resolve_processes()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            # spawn, not fork: the parent already runs HTTP/browser threads
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm
+        )
+        logger.info(f"[PARSE POOL] {self.processes} worker processes")
+
+    def parse(self, content, records=True):
+        """Same contract as parse_html(): (PageRecords or None, hrefs)."""
+        columns, hrefs = self._executor.submit(_parse, content, records).result()
+        return (PageRecords.from_columns(columns) if columns is not None else None), hrefs
+
+    def parse_and_build(self, content, page_url, fields=None):
+        """
+        parse() and build_page() in one round trip, for fused crawls:
+        (field-filtered PageRecords, hrefs, built page or None).
+        """
+        columns, hrefs, page = self._executor.submit(
+            _parse_and_build, content, page_url, fields
+        ).result()
+        return PageRecords.from_columns(columns), hrefs, page
+
+    def build_page(self, page):
+        """Same output as pipeline.build_page() without LLM enhancement or boilerplate."""
+        columns = as_page_records(page["page_data"]).to_columns()
+        return self._executor.submit(_build, page["page_url"], columns).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def resolve_processes(value=None):
+    value = str(PARSE_PROCESSES if value is None else value).lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    return int(value)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool():
+    """Shared ParsePool when PARSE_PROCESSES is set, else None (parse in-thread)."""
+    global _pool
+    if _pool is None and resolve_processes() > 0:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ParsePool()
+                atexit.register(_pool.close)
+    return _pool
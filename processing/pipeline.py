@@ -0,0 +1,124 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from config import EXTRACT_WORKERS, PIPELINE_QUEUE_SIZE, LLM_CONCURRENCY
+from core.logger import logger
+from processing.llm_enhancer import get_enhancer
+from processing.content_extractor import extract_meaningful_content, extract_image_info
+from processing.dedup import skip_near_duplicates
+from processing.parse_pool import get_parse_pool
+
+
+def threaded_map(fn, items, workers=None, max_pending=None):
+    """
+    Lazily apply `fn` to `items` on a small thread pool, in order.
+
+    `items` is consumed in the caller's thread; at most `max_pending`
+    results are buffered, so a slow consumer back-pressures the producer
+    instead of letting pages pile up in memory.
+    """
+    workers = workers or EXTRACT_WORKERS
+    max_pending = max(max_pending or PIPELINE_QUEUE_SIZE, workers)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stage") as executor:
+        pending = deque()
+
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            while len(pending) >= max_pending or (pending and pending[0].done()):
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def with_data(pages, total=None):
+    """Progress reporting + drop pages that produced no records."""
+    for i, page in enumerate(pages, 1):
+        page_url = page["page_url"]
+        print(f"🔍 [{i}/{total or '?'}] {page_url}")
+
+        if page["page_data"]:
+            logger.info(f"Data extracted from {page_url}")
+            yield page
+        else:
+            logger.warning(f"No data extracted from {page_url}")
+
+
+def build_page(page, boilerplate=None, enhance=True):
+    content = extract_meaningful_content(
+        page["page_data"], page["page_url"], boilerplate, enhance=enhance
+    )
+    image_info = extract_image_info(page["page_data"])
+
+    return {
+        "page_url": page["page_url"],
+        "content": content,   # ✅ contains {text, videos}
+        "image_count": image_info["image_count"],
+        "image_urls": image_info["image_urls"]
+    }
+
+
+def strip_boilerplate(page, boilerplate):
+    """Boilerplate pass over a page built without the index (e.g. on the parse pool)."""
+    blocks = page["content"]["text"].split("\n\n")
+    page["content"]["text"] = "\n\n".join(boilerplate.strip(blocks))
+    return page
+
+
+def _enhance_page(enhancer, page):
+    page["content"]["text"] = enhancer.enhance(page["content"]["text"])
+    return page
+
+
+def enhance_pages(pages, enhancer=None):
+    """
+    LLM enhancement stage with LLM_CONCURRENCY pages in flight; passes
+    pages through unchanged when no LLM is configured.
+    """
+    enhancer = enhancer or get_enhancer()
+    if enhancer is None:
+        yield from pages
+        return
+
+    logger.info("🧠 LLM enhancement stage enabled")
+    yield from threaded_map(
+        partial(_enhance_page, enhancer),
+        pages,
+        workers=LLM_CONCURRENCY,
+        max_pending=LLM_CONCURRENCY * 2
+    )
+
+
+def extract_pages(pages, workers=None, boilerplate=None, dedup=None):
+    """
+    Streaming extract stage: scraped pages in, export-ready pages out.
+    Pass a BoilerplateIndex to strip text repeated across the crawl, and
+    a NearDuplicateIndex to drop near-duplicates by their extracted text
+    before they reach the LLM or the exporter.
+
+    With an LLM configured, enhancement is a separate stage with
+    LLM_CONCURRENCY pages in flight, so rule-based extraction never
+    waits on API latency. With a parse pool, extraction runs on the
+    pool's worker processes (pages a fused crawl already extracted there
+    are not rebuilt); only the cheap boilerplate strip, which needs every
+    page's blocks in one index, stays in this process.
+    """
+    enhancer = get_enhancer()
+    pool = get_parse_pool()
+
+    if pool is not None:
+        workers = workers or pool.processes
+        built = threaded_map(
+            lambda page: page.get("extracted") or pool.build_page(page), pages, workers=workers
+        )
+        if boilerplate is not None:
+            built = (strip_boilerplate(page, boilerplate) for page in built)
+    else:
+        build = partial(build_page, boilerplate=boilerplate, enhance=enhancer is None)
+        built = threaded_map(build, pages, workers=workers)
+    if dedup is not None:
+        built = skip_near_duplicates(built, dedup, boilerplate)
+
+    yield from enhance_pages(built, enhancer)
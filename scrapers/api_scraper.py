@@ -1,6 +1,22 @@
-import requests
 import re
-from urllib.parse import urljoin
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+
+from config import (
+    API_PROBE_TIMEOUT,
+    API_DISCOVERY_WORKERS,
+    API_CACHE_TTL,
+    API_NEGATIVE_CACHE_TTL,
+    API_PAGE_CONCURRENCY,
+    API_MAX_PAGES
+)
+from core.http import http_get
+from core.logger import logger
+from processing.pipeline import threaded_map
 
 COMMON_API_PATHS = [
     "/api",
@@ -12,98 +28,401 @@ COMMON_API_PATHS = [
     "/v2"
 ]
 
+API_URL_PATTERN = re.compile(
+    r'https?://[^"\']+/(?:api|wp-json|graphql|v1|v2)[^"\']*',
+    re.IGNORECASE
+)
+
+# Where paginated APIs put the next page's URL
+NEXT_KEYS = ["next", "next_page_url", "nextPage", "next_url"]
+TOTAL_PAGES_KEYS = ["total_pages", "totalPages", "last_page", "num_pages", "pages"]
+PAGE_PARAMS = {"page", "p", "pg", "paged", "page_number", "pagenumber"}
+OFFSET_PARAMS = {"offset", "start", "skip", "from"}
+# Kept from the discovery probe so its response can serve as the first page
+PAGINATION_HEADERS = ("Link", "X-WP-TotalPages")
+
+# domain -> (expires_at, endpoint, data, headers); endpoint None = "no API here"
+_discovery_cache = {}
+_cache_lock = threading.Lock()
+
+
 def is_json_response(resp):
     ct = resp.headers.get("Content-Type", "").lower()
     return "application/json" in ct
 
-def try_direct_api(url):
+
+def _pagination_headers(r):
+    return {k: r.headers[k] for k in PAGINATION_HEADERS if k in r.headers}
+
+
+def probe_endpoint(url, with_headers=False):
+    """(url, data) of a JSON endpoint, or (None, None); `with_headers` adds its pagination headers."""
+    found = (None, None, {})
     try:
-        r = requests.get(url, timeout=15)
+        r = http_get(url, timeout=API_PROBE_TIMEOUT, retries=0)
         r.encoding = "utf-8"
-    except Exception:
-        return None, None
+    except requests.RequestException:
+        r = None
 
-    if r.status_code == 200 and is_json_response(r):
+    if r is not None and r.status_code == 200 and is_json_response(r):
         try:
-            return url, r.json()
-        except Exception:
-            return None, None
+            found = (url, r.json(), _pagination_headers(r))
+        except ValueError:
+            pass
 
-    return None, None
+    return found if with_headers else found[:2]
 
-def try_common_paths(base_url):
-    for path in COMMON_API_PATHS:
-        endpoint = urljoin(base_url.rstrip("/") + "/", path.lstrip("/"))
+
+def common_path_candidates(base_url):
+    return [
+        urljoin(base_url.rstrip("/") + "/", path.lstrip("/"))
+        for path in COMMON_API_PATHS
+    ]
+
+
+def _scan_for_api_urls(r):
+    r.encoding = r.apparent_encoding or "utf-8"
+    return list(dict.fromkeys(API_URL_PATTERN.findall(r.text)))
+
+
+def html_api_candidates(base_url):
+    try:
+        r = http_get(base_url, timeout=API_PROBE_TIMEOUT, retries=0)
+    except requests.RequestException:
+        return []
+
+    return _scan_for_api_urls(r)
+
+
+def _probe_and_scan(url):
+    # One download serves both the direct probe and the HTML scan
+    try:
+        r = http_get(url, timeout=API_PROBE_TIMEOUT, retries=0)
+    except requests.RequestException:
+        return None, None, {}, []
+
+    if r.status_code == 200 and is_json_response(r):
         try:
-            r = requests.get(endpoint, timeout=15)
             r.encoding = "utf-8"
-        except Exception:
-            continue
+            return url, r.json(), _pagination_headers(r), []
+        except ValueError:
+            return None, None, {}, []
+
+    return None, None, {}, _scan_for_api_urls(r)
 
-        if r.status_code == 200 and is_json_response(r):
-            try:
-                return endpoint, r.json()
-            except Exception:
-                continue
 
+def try_direct_api(url):
+    return probe_endpoint(url)
+
+
+def try_common_paths(base_url):
+    for endpoint in common_path_candidates(base_url):
+        endpoint, data = probe_endpoint(endpoint)
+        if data:
+            return endpoint, data
     return None, None
 
+
 def discover_api_from_html(base_url):
-    try:
-        r = requests.get(base_url, timeout=15)
-        r.encoding = r.apparent_encoding or "utf-8"
-    except Exception:
-        return None, None
-
-    matches = re.findall(
-        r'https?://[^"\']+/(api|wp-json|graphql|v1|v2)[^"\']*',
-        r.text,
-        re.IGNORECASE
+    for url in html_api_candidates(base_url):
+        url, data = probe_endpoint(url)
+        if data:
+            return url, data
+    return None, None
+
+
+def discover_api(url):
+    """
+    Probe the direct URL, COMMON_API_PATHS and endpoints referenced in the
+    page HTML all at once. Returns the first (endpoint, data, pagination
+    headers) that answers with JSON; outstanding probes are cancelled.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=API_DISCOVERY_WORKERS,
+        thread_name_prefix="api-probe"
     )
+    probed = set()
 
-    for url in set(matches):
-        try:
-            r2 = requests.get(url, timeout=15)
-            r2.encoding = "utf-8"
-        except Exception:
-            continue
+    def submit_probe(candidate):
+        if candidate in probed:
+            return None
+        probed.add(candidate)
+        return executor.submit(probe_endpoint, candidate, True)
 
-        if r2.status_code == 200 and is_json_response(r2):
-            try:
-                return url, r2.json()
-            except Exception:
-                continue
+    try:
+        probed.add(url)
+        direct = executor.submit(_probe_and_scan, url)
+
+        pending = {direct}
+        pending.update(submit_probe(c) for c in common_path_candidates(url))
+        pending.discard(None)
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future is direct:
+                    endpoint, data, headers, candidates = future.result()
+                    for candidate in candidates:
+                        probe = submit_probe(candidate)
+                        if probe is not None:
+                            pending.add(probe)
+                else:
+                    endpoint, data, headers = future.result()
+
+                if data:
+                    return endpoint, data, headers
+
+        return None, None, {}
+    finally:
+        # Don't wait for slow losers
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _cached_discovery(url, refresh=False):
+    """(endpoint, data, pagination headers) of the API for `url`'s domain."""
+    domain = urlparse(url).netloc
+    now = time.time()
+
+    with _cache_lock:
+        entry = _discovery_cache.get(domain)
+
+    if entry and not refresh and entry[0] > now:
+        logger.info(f"[API] Using cached discovery for {domain} (endpoint={entry[1]})")
+        return entry[1:]
+
+    endpoint, data, headers = discover_api(url)
+    ttl = API_CACHE_TTL if data else API_NEGATIVE_CACHE_TTL
+
+    with _cache_lock:
+        _discovery_cache[domain] = (now + ttl, endpoint, data, headers)
+
+    return endpoint, data, headers
+
+
+def clear_api_cache():
+    with _cache_lock:
+        _discovery_cache.clear()
 
-    return None, None
 
-def scrape_via_api(url, fields=None, preview=False):
+def records_from(data):
+    """JSON body → list of records (a list, `results`, or the single dict), or None."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and "results" in data:
+        return data["results"]
+    if isinstance(data, dict):
+        return [data]
+    return None
+
+
+def _project(records, fields):
+    if not fields:
+        return records
+    return [{k: rec.get(k) for k in fields} for rec in records if isinstance(rec, dict)]
+
+
+def scrape_via_api(url, fields=None, preview=False, refresh=False):
     """
     ALWAYS returns: (records, api_endpoint)
-    """
-    endpoint, data = try_direct_api(url)
-
-    if not data:
-        endpoint, data = try_common_paths(url)
 
-    if not data:
-        endpoint, data = discover_api_from_html(url)
+    Discovery results (positive or negative) are cached per domain, so a
+    preview call followed by a full call costs a single discovery.
+    Only the endpoint's first response is used; iter_api_records()
+    follows pagination.
+    """
+    endpoint, data, _ = _cached_discovery(url, refresh=refresh)
 
     if not data:
         return [], None   # 🔑 CRITICAL
 
-    if isinstance(data, list):
-        records = data
-    elif isinstance(data, dict) and "results" in data:
-        records = data["results"]
-    elif isinstance(data, dict):
-        records = [data]
-    else:
+    records = records_from(data)
+    if records is None:
         return [], None
 
     if preview:
         return records[:5], endpoint
 
-    if fields:
-        records = [{k: rec.get(k) for k in fields} for rec in records]
+    return _project(records, fields), endpoint
+
+
+# ─────────────────────────────────────────────
+# 📚 PAGINATION
+# ─────────────────────────────────────────────
+def next_page_url(r, data, current):
+    """`next` from the Link header or the JSON body (DRF, Laravel, HAL, ...)."""
+    nxt = r.links.get("next", {}).get("url")
+
+    if not nxt and isinstance(data, dict):
+        for key in NEXT_KEYS:
+            value = data.get(key)
+            if isinstance(value, str) and value:
+                nxt = value
+                break
+
+        links = data.get("links") or data.get("_links")
+        if not nxt and isinstance(links, dict):
+            value = links.get("next")
+            if isinstance(value, dict):
+                value = value.get("href")
+            if isinstance(value, str) and value:
+                nxt = value
+
+    return urljoin(current, nxt) if nxt else None
+
+
+def _total_pages(r, data, page_size):
+    total = r.headers.get("X-WP-TotalPages")
+    if total and total.isdigit():
+        return int(total)
+
+    if isinstance(data, dict):
+        for key in TOTAL_PAGES_KEYS:
+            if isinstance(data.get(key), int):
+                return data[key]
+        count = data.get("count", data.get("total"))
+        if isinstance(count, int) and page_size:
+            return -(-count // page_size)
+
+    return None
+
+
+def _set_param(url, name, value):
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != name]
+    query.append((name, str(value)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _numeric_step(current, nxt):
+    """
+    (param, next value, step) when `nxt` only advances one page/offset
+    parameter of `current` (page=2→3, offset=20→40); None for cursors.
+    Later pages are built from `nxt`, so params it adds are kept.
+    """
+    cur_parts, next_parts = urlsplit(current), urlsplit(nxt)
+    if (cur_parts.netloc, cur_parts.path) != (next_parts.netloc, next_parts.path):
+        return None
+
+    cur = dict(parse_qsl(cur_parts.query))
+    new = dict(parse_qsl(next_parts.query))
+    changed = [k for k, v in new.items() if cur.get(k) != v]
+    counters = [k for k in changed if k.lower() in PAGE_PARAMS | OFFSET_PARAMS and new[k].isdigit()]
+    # Besides the counter, `next` may only add fixed params (e.g. format=json)
+    if len(counters) != 1 or any(k in cur for k in changed if k != counters[0]):
+        return None
+
+    name = counters[0]
+    start = cur.get(name, "0" if name.lower() in OFFSET_PARAMS else "1")
+    if not start.isdigit():
+        return None
+
+    step = int(new[name]) - int(start)
+    return (name, int(new[name]), step) if step > 0 else None
+
+
+class _PageFetcher:
+    """Fetches page URLs for threaded_map; the first empty/failed page stops generation."""
+
+    def __init__(self):
+        self.exhausted = False
+
+    def __call__(self, page_url):
+        try:
+            r = http_get(page_url)
+            r.raise_for_status()
+            records = records_from(r.json()) or []
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"[API] Page {page_url} failed: {e}")
+            records = []
+
+        if not records:
+            self.exhausted = True
+        return records
+
+
+def _follow_cursor(nxt, fields, max_pages):
+    # Opaque cursors: every page names the next one, so fetch sequentially
+    seen = set()
+    pages = 1
+    while nxt and nxt not in seen and pages < max_pages:
+        seen.add(nxt)
+        try:
+            r = http_get(nxt)
+            r.raise_for_status()
+            data = r.json()
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"[API] Page {nxt} failed: {e}")
+            return
+
+        records = records_from(data) or []
+        if not records:
+            return
+        pages += 1
+        yield from _project(records, fields)
+        nxt = next_page_url(r, data, nxt)
+
+
+def iter_api_records(url, fields=None, max_pages=None, concurrency=None, refresh=False):
+    """
+    Stream every record of the API discovered for `url`, page by page.
+
+    The (cached) discovery probe's response is the first page, so it is
+    not downloaded again; pass refresh=True for a fresh one. The
+    pagination scheme is detected from it:
+    - `next` links (Link header or JSON) that step a numeric page/offset
+      parameter, or WordPress X-WP-TotalPages: the remaining page URLs
+      are generated and fetched concurrently, `concurrency` at a time,
+      up to the advertised total or the first empty page
+    - opaque cursors: followed one page at a time
+    Records are yielded in page order and never held all at once.
+    """
+    max_pages = max_pages or API_MAX_PAGES
+    concurrency = concurrency or API_PAGE_CONCURRENCY
+
+    endpoint, data, headers = _cached_discovery(url, refresh=refresh)
+    if not endpoint:
+        return
+
+    # Stand-in for the probe's response: next_page_url()/_total_pages() read its headers
+    r = requests.Response()
+    r.url = endpoint
+    r.headers.update(headers)
+
+    first = records_from(data) or []
+    yield from _project(first, fields)
+
+    nxt = next_page_url(r, data, endpoint)
+    total_pages = _total_pages(r, data, len(first))
+
+    if nxt:
+        step = _numeric_step(endpoint, nxt)
+        if step is None:
+            logger.info(f"[API] Cursor pagination at {endpoint}")
+            yield from _follow_cursor(nxt, fields, max_pages)
+            return
+    elif total_pages and total_pages > 1:
+        step = ("page", 2, 1)
+    else:
+        return
+
+    name, value, increment = step
+    template = nxt or endpoint
+    if total_pages:
+        max_pages = min(max_pages, total_pages)
+
+    logger.info(
+        f"[API] Paginating {endpoint} by '{name}' (step {increment}, "
+        f"{total_pages or 'unknown'} pages, {concurrency} concurrent)"
+    )
+
+    fetch = _PageFetcher()
+
+    def page_urls():
+        for i in range(max_pages - 1):
+            if fetch.exhausted:
+                return
+            yield _set_param(template, name, value + i * increment)
 
-    return records, endpoint
+    for records in threaded_map(fetch, page_urls(), workers=concurrency, max_pending=concurrency * 2):
+        yield from _project(records, fields)
@@ -0,0 +1,157 @@
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
+
+from playwright.sync_api import sync_playwright
+
+from config import HEADLESS, BROWSER_POOL_SIZE, BROWSER_RECYCLE_AFTER
+from core.logger import logger
+from scrapers.resource_policy import ResourcePolicy
+
+
+class _BrowserWorker(threading.Thread):
+    """
+    Owns one Chromium for its whole life.
+
+    Playwright's sync API is bound to the thread that started it, so every
+    browser lives on its own worker thread and tasks are shipped to it.
+    The context/page is kept warm between tasks and recycled after
+    `recycle_after` navigations, after a failure, or when the browser dies.
+    """
+
+    def __init__(self, pool, index):
+        super().__init__(name=f"browser-{index}", daemon=True)
+        self.pool = pool
+        self.index = index
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._navigations = 0
+
+    # ── lifecycle ────────────────────────────
+    def _launch(self):
+        if self._pw is None:
+            self._pw = sync_playwright().start()
+        self._browser = self._pw.chromium.launch(headless=self.pool.headless)
+        logger.info(f"[BROWSER POOL] Worker {self.index} launched Chromium")
+
+    def _new_context(self):
+        self._close_context()
+        if self._browser is None or not self._browser.is_connected():
+            self._launch()
+
+        self._context = self._browser.new_context()
+        self.pool.resource_policy.apply(self._context)
+        self._page = self._context.new_page()
+        self._navigations = 0
+
+    def _close_context(self):
+        if self._context is not None:
+            try:
+                self._context.close()
+            except Exception:
+                pass
+        self._context = None
+        self._page = None
+
+    def _shutdown(self):
+        self._close_context()
+        try:
+            if self._browser is not None:
+                self._browser.close()
+            if self._pw is not None:
+                self._pw.stop()
+        except Exception:
+            pass
+        self._browser = None
+        self._pw = None
+
+    # ── task loop ────────────────────────────
+    def run(self):
+        while True:
+            task = self.pool._tasks.get()
+            if task is None:
+                self._shutdown()
+                return
+
+            fn, args, kwargs, future = task
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                if self._page is None or self._page.is_closed() \
+                        or self._navigations >= self.pool.recycle_after:
+                    self._new_context()
+
+                self._navigations += 1
+                result = fn(self._page, *args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+                # Never reuse a page that may be wedged or crashed
+                self._close_context()
+            else:
+                future.set_result(result)
+
+
+class BrowserPool:
+    """
+    Long-lived pool of `size` Chromium workers.
+
+    submit(fn, *args) runs fn(page, *args) on a warm page and returns a
+    Future; run() is the blocking shortcut. Up to `size` pages render in
+    parallel. Every context gets `resource_policy` routing applied.
+
+    Each browser runs exactly one context with one page: a sync-API
+    Playwright call blocks its thread, and the browser can't be driven
+    from another one, so extra contexts would only take turns. Scale
+    with BROWSER_POOL_SIZE instead.
+    """
+
+    def __init__(self, size=None, recycle_after=None, headless=None, resource_policy=None):
+        self.size = size or BROWSER_POOL_SIZE
+        self.recycle_after = recycle_after or BROWSER_RECYCLE_AFTER
+        self.headless = HEADLESS if headless is None else headless
+        self.resource_policy = resource_policy or ResourcePolicy()
+
+        self._tasks = queue.Queue()
+        self._workers = [_BrowserWorker(self, i) for i in range(self.size)]
+        self._closed = False
+
+        for w in self._workers:
+            w.start()
+
+    def submit(self, fn, *args, **kwargs):
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+        future = Future()
+        self._tasks.put((fn, args, kwargs, future))
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        return self.submit(fn, *args, **kwargs).result()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._tasks.put(None)
+        for w in self._workers:
+            w.join(timeout=30)
+        logger.info(f"[BROWSER POOL] Closed (blocked requests: {self.resource_policy.blocked})")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool()
+                atexit.register(_pool.close)
+    return _pool
@@ -1,81 +1,351 @@
-from playwright.sync_api import sync_playwright
+import time
+from concurrent.futures import as_completed
 
-def scrape_dynamic(url, fields=None, preview=False):
-    data = []
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-
-        page.goto(url, timeout=60000)
-        page.wait_for_load_state("networkidle")
-        page.wait_for_timeout(3000)
-
-        page.evaluate("""
-        () => new Promise(resolve => {
-            let y = 0;
-            const step = 600;
-            const timer = setInterval(() => {
-                window.scrollBy(0, step);
-                y += step;
-                if (y > document.body.scrollHeight) {
-                    clearInterval(timer);
-                    resolve();
-                }
-            }, 250);
-        })
-        """)
-        page.wait_for_timeout(2000)
-
-        elements = page.query_selector_all("body *")
-
-        for el in elements:
-            try:
-                tag_name = el.evaluate("e => e.tagName.toLowerCase()")
+from playwright.sync_api import Error as PlaywrightError
 
-                inner = el.inner_text() or ""
-                text_content = el.evaluate("e => e.textContent") or ""
-                aria = el.get_attribute("aria-label") or ""
-                title = el.get_attribute("title") or ""
+from config import (
+    DYNAMIC_EXTRACTION,
+    DOM_CHUNK_SIZE,
+    SETTLE_MODE,
+    SETTLE_QUIET_MS,
+    SETTLE_MAX_MS,
+    SETTLE_POLL_MS
+)
+from core.logger import logger
+from core.politeness import get_scheduler
+from core.records import PageRecords
+from core.utils import filter_fields
+from scrapers.browser_pool import get_browser_pool
 
-                src = (
-                    el.get_attribute("src")
-                    or el.get_attribute("data-src")
-                    or el.get_attribute("srcset")
-                )
 
-            except Exception:
-                continue
+# Records the time of the last DOM mutation; survives until the next navigation.
+# Attributes are not watched: carousels, spinners and class-toggling
+# animations change them forever and would keep the page from going quiet.
+_MUTATION_PROBE_JS = """
+    if (!window.__usProbe) {
+        window.__usProbe = { last: performance.now() };
+        new MutationObserver(() => { window.__usProbe.last = performance.now(); })
+            .observe(document, { subtree: true, childList: true, characterData: true });
+    }
+"""
+
+INSTALL_MUTATION_PROBE_JS = "() => {" + _MUTATION_PROBE_JS + "}"
+
+# Re-installs the probe first: a script navigation after domcontentloaded
+# (consent/locale redirect, location.replace) leaves a document without it
+SCROLL_AND_PROBE_JS = """
+() => {""" + _MUTATION_PROBE_JS + """
+    window.scrollTo(0, document.body ? document.body.scrollHeight : 0);
+    return {
+        height: document.body ? document.body.scrollHeight : 0,
+        quietMs: performance.now() - window.__usProbe.last
+    };
+}
+"""
+
+
+def _settle_fixed(page):
+    page.wait_for_load_state("networkidle")
+    page.wait_for_timeout(3000)
+
+    page.evaluate("""
+    () => new Promise(resolve => {
+        let y = 0;
+        const step = 600;
+        const timer = setInterval(() => {
+            window.scrollBy(0, step);
+            y += step;
+            if (y > document.body.scrollHeight) {
+                clearInterval(timer);
+                resolve();
+            }
+        }, 250);
+    })
+    """)
+    page.wait_for_timeout(2000)
+
+
+class NetworkTracker:
+    """
+    In-flight requests of a page and the time of the last network event.
+
+    Create it before page.goto() so requests started during navigation
+    are counted too; close() removes the listeners.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.pending = set()
+        self.last_event = time.monotonic()
+
+        page.on("request", self._on_start)
+        page.on("requestfinished", self._on_end)
+        page.on("requestfailed", self._on_end)
+
+    def _on_start(self, request):
+        self.pending.add(request)
+        self.last_event = time.monotonic()
+
+    def _on_end(self, request):
+        self.pending.discard(request)
+        self.last_event = time.monotonic()
+
+    def quiet_ms(self):
+        return (time.monotonic() - self.last_event) * 1000
+
+    def close(self):
+        self.page.remove_listener("request", self._on_start)
+        self.page.remove_listener("requestfinished", self._on_end)
+        self.page.remove_listener("requestfailed", self._on_end)
+
 
-            combined = " ".join([
-                inner.strip(),
-                text_content.strip(),
-                aria.strip(),
-                title.strip()
-            ]).strip()
+def _settle_adaptive(page, network=None, quiet_ms=None, max_ms=None, poll_ms=None):
+    """
+    Scroll to the bottom until the page stops growing, then wait until
+    neither DOM mutations nor network requests have happened for
+    `quiet_ms`. Gives up after `max_ms`.
 
-            if not combined and tag_name not in ("video", "source"):
+    Pass the NetworkTracker started before navigation as `network`;
+    without one, tracking starts here and requests already in flight
+    are not seen.
+    """
+    quiet_ms = quiet_ms or SETTLE_QUIET_MS
+    max_ms = max_ms or SETTLE_MAX_MS
+    poll_ms = poll_ms or SETTLE_POLL_MS
+
+    own_tracker = network is None
+    if own_tracker:
+        network = NetworkTracker(page)
+
+    start = time.monotonic()
+    deadline = start + max_ms / 1000
+    settled = False
+
+    try:
+        page.wait_for_load_state("domcontentloaded")
+        page.evaluate(INSTALL_MUTATION_PROBE_JS)
+
+        last_height = -1
+        while time.monotonic() < deadline:
+            try:
+                probe = page.evaluate(SCROLL_AND_PROBE_JS)
+            except PlaywrightError as e:
+                # Context destroyed by a navigation mid-poll: wait for the new document
+                logger.debug(f"[SETTLE] Page navigated while settling: {e}")
+                last_height = -1
+                page.wait_for_load_state("domcontentloaded")
                 continue
 
-            data.append({
-                "tag": tag_name,
-                "text": combined,
-                "href": el.get_attribute("href"),
-                "src": src
-            })
+            if probe["height"] == last_height \
+                    and probe["quietMs"] >= quiet_ms \
+                    and not network.pending \
+                    and network.quiet_ms() >= quiet_ms:
+                settled = True
+                break
+
+            last_height = probe["height"]
+            page.wait_for_timeout(poll_ms)
+    finally:
+        if own_tracker:
+            network.close()
+
+    waited_ms = int((time.monotonic() - start) * 1000)
+    if not settled:
+        logger.info(f"[SETTLE] Cap reached after {waited_ms} ms ({len(network.pending)} requests pending) on {page.url}")
+    return waited_ms
+
+
+def track_network(page):
+    """NetworkTracker to create before page.goto() in adaptive mode, else None."""
+    return NetworkTracker(page) if SETTLE_MODE == "adaptive" else None
+
+
+def prepare_page(page, network=None):
+    """
+    Wait for the page to finish rendering; returns ms spent waiting.
+    `network` is the tracker from track_network(), if one was started.
+    """
+    start = time.monotonic()
+
+    if SETTLE_MODE == "adaptive":
+        _settle_adaptive(page, network)
+    else:
+        _settle_fixed(page)
+
+    waited_ms = int((time.monotonic() - start) * 1000)
+    logger.info(f"[SETTLE] {SETTLE_MODE} settle took {waited_ms} ms on {page.url}")
+    return waited_ms
+
+
+# Same record logic as the per-element walk, executed inside the page.
+# Rows come back as compact [tag, text, href, src] arrays.
+EXTRACT_ELEMENTS_JS = """
+({ offset, limit }) => {
+    const all = document.querySelectorAll("body *");
+    const end = limit > 0 ? Math.min(all.length, offset + limit) : all.length;
+    const rows = [];
+
+    for (let i = offset; i < end; i++) {
+        const el = all[i];
+        // Playwright's inner_text() rejects non-HTML nodes (e.g. SVG)
+        if (!(el instanceof HTMLElement)) continue;
+
+        const tag = el.tagName.toLowerCase();
+        const combined = [
+            (el.innerText || "").trim(),
+            (el.textContent || "").trim(),
+            (el.getAttribute("aria-label") || "").trim(),
+            (el.getAttribute("title") || "").trim()
+        ].join(" ").trim();
+
+        if (!combined && tag !== "video" && tag !== "source") continue;
 
-        browser.close()
+        rows.push([
+            tag,
+            combined,
+            el.getAttribute("href"),
+            el.getAttribute("src") || el.getAttribute("data-src") || el.getAttribute("srcset")
+        ]);
+    }
+
+    return { rows, total: all.length };
+}
+"""
+
+
+def extract_dynamic_elements_batched(page, chunk_size=None):
+    chunk_size = DOM_CHUNK_SIZE if chunk_size is None else chunk_size
+
+    data = PageRecords()
+    offset = 0
+
+    while True:
+        payload = page.evaluate(
+            EXTRACT_ELEMENTS_JS,
+            {"offset": offset, "limit": chunk_size}
+        )
+
+        for tag, text, href, src in payload["rows"]:
+            data.append(tag, text, href, src)
+
+        if chunk_size <= 0:
+            break
+        offset += chunk_size
+        if offset >= payload["total"]:
+            break
+
+    return data
+
+
+def extract_dynamic_elements(page):
+    if DYNAMIC_EXTRACTION == "batched":
+        return extract_dynamic_elements_batched(page)
+    return extract_dynamic_elements_per_element(page)
+
+
+def extract_dynamic_elements_per_element(page):
+    data = PageRecords()
+
+    elements = page.query_selector_all("body *")
+
+    for el in elements:
+        try:
+            tag_name = el.evaluate("e => e.tagName.toLowerCase()")
+
+            inner = el.inner_text() or ""
+            text_content = el.evaluate("e => e.textContent") or ""
+            aria = el.get_attribute("aria-label") or ""
+            title = el.get_attribute("title") or ""
+
+            src = (
+                el.get_attribute("src")
+                or el.get_attribute("data-src")
+                or el.get_attribute("srcset")
+            )
+
+        except Exception:
+            continue
+
+        combined = " ".join([
+            inner.strip(),
+            text_content.strip(),
+            aria.strip(),
+            title.strip()
+        ]).strip()
+
+        if not combined and tag_name not in ("video", "source"):
+            continue
+
+        data.append(
+            tag_name,
+            combined,
+            el.get_attribute("href"),
+            src
+        )
+
+    return data
+
+
+def polite_goto(page, url, timeout=60000):
+    """page.goto() paced and measured by the per-host politeness scheduler."""
+    scheduler = get_scheduler()
+    if scheduler is None:
+        return page.goto(url, timeout=timeout)
+
+    scheduler.wait(url)
+    start = time.monotonic()
+    try:
+        response = page.goto(url, timeout=timeout)
+    except Exception:
+        scheduler.failed(url)
+        raise
+
+    if response is not None:
+        scheduler.observe(
+            url, response.status,
+            latency=time.monotonic() - start,
+            retry_after=response.headers.get("retry-after")
+        )
+    return response
+
+
+def render_page(page, url):
+    """Runs on a pooled browser worker: load, settle, extract."""
+    network = track_network(page)
+    try:
+        polite_goto(page, url)
+        prepare_page(page, network)
+    finally:
+        if network is not None:
+            network.close()
+    return extract_dynamic_elements(page)
+
+
+def scrape_dynamic(url, fields=None, preview=False):
+    data = get_browser_pool().run(render_page, url)
 
     if preview:
         return data[:10]
 
     # 🔒 PRESERVE STRUCTURAL DATA
-    if fields:
-        return [{
-            "tag": d.get("tag"),
-            "text": d.get("text") if "text" in fields else None,
-            "href": d.get("href"),
-            "src": d.get("src")
-        } for d in data]
+    return filter_fields(data, fields)
 
-    return data
+
+def scrape_dynamic_many(urls, fields=None):
+    """
+    Render many URLs in parallel on the browser pool.
+
+    Yields {"page_url", "page_data"} as renders complete; page_data is
+    None when the render failed.
+    """
+    pool = get_browser_pool()
+    futures = {pool.submit(render_page, url): url for url in urls}
+
+    for future in as_completed(futures):
+        url = futures[future]
+        try:
+            data = filter_fields(future.result(), fields)
+        except Exception as e:
+            logger.warning(f"[DYNAMIC] Failed to render {url}: {e}")
+            data = None
+        yield {"page_url": url, "page_data": data}
@@ -0,0 +1,126 @@
+from bs4 import BeautifulSoup
+
+from config import PARSER_BACKEND
+from core.logger import logger
+from core.records import PageRecords
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+STATIC_TAGS = ["h1", "h2", "p", "a", "img", "li", "video", "source"]
+
+# Tree builder for the bs4 backend: "lxml" needs lxml too, the stdlib one always works
+BS4_FEATURES = "lxml" if LXML_AVAILABLE else "html.parser"
+
+# BeautifulSoup's get_text() leaves these out as well
+_NON_TEXT_TAGS = {"script", "style", "template"}
+
+
+def resolve_backend(backend=None):
+    backend = (backend or PARSER_BACKEND).lower()
+    if backend == "auto":
+        return "lxml" if LXML_AVAILABLE else "bs4"
+    if backend == "lxml" and not LXML_AVAILABLE:
+        logger.warning("[PARSER] lxml not installed, falling back to bs4")
+        return "bs4"
+    return backend
+
+
+def _element_src(get):
+    return get("src") or get("data-src") or get("data-lazy") or get("srcset")
+
+
+# ─────────────────────────────
+# bs4 backend
+# ─────────────────────────────
+def extract_static_elements(soup):
+    data = PageRecords()
+    for tag in soup.find_all(STATIC_TAGS):
+        data.append(
+            tag.name.lower(),
+            tag.get_text(strip=True),
+            tag.get("href"),
+            _element_src(tag.get)
+        )
+
+    return data
+
+
+def _parse_bs4(content, records):
+    soup = BeautifulSoup(content.decode("utf-8", errors="replace"), BS4_FEATURES)
+    data = extract_static_elements(soup) if records else None
+    hrefs = [a["href"] for a in soup.find_all("a", href=True)]
+    return data, hrefs
+
+
+# ─────────────────────────────
+# lxml backend
+# ─────────────────────────────
+def _collect_text(node, parts):
+    for child in node:
+        # Comments/PIs have a non-string tag: skip their text, keep the tail
+        if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+            if child.text:
+                parts.append(child.text)
+            _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def _element_text(el):
+    """Equivalent of BeautifulSoup's get_text(strip=True)."""
+    parts = [el.text] if el.text else []
+    _collect_text(el, parts)
+    return "".join(p.strip() for p in parts)
+
+
+def _parse_lxml(content, records):
+    if not content or not content.strip():
+        return (PageRecords() if records else None), []
+
+    parser = lxml.html.HTMLParser(encoding="utf-8")
+    try:
+        root = lxml.html.document_fromstring(content, parser=parser)
+    except (etree.ParserError, ValueError):
+        return (PageRecords() if records else None), []
+
+    hrefs = []
+
+    if not records:
+        for a in root.iter("a"):
+            href = a.get("href")
+            if href is not None:
+                hrefs.append(href)
+        return None, hrefs
+
+    # bs4 treats everything under <template> as non-text (rare, usually empty)
+    in_template = {d for t in root.iter("template") for d in t.iterdescendants()}
+
+    # ONE walk: records for every STATIC_TAG, links taken from the <a> rows
+    data = PageRecords()
+    for el in root.iter(*STATIC_TAGS):
+        href = el.get("href")
+        tag = el.tag.lower()
+        text = "" if el in in_template else _element_text(el)
+        data.append(tag, text, href, _element_src(el.get))
+        if tag == "a" and href is not None:
+            hrefs.append(href)
+
+    return data, hrefs
+
+
+def parse_html(content, records=True, backend=None):
+    """
+    Raw HTML bytes → (PageRecords or None, hrefs of <a href>).
+
+    Decodes as UTF-8 like the scrapers always have. The lxml backend
+    builds no BeautifulSoup tree and collects records and links in a
+    single pass; it is the default whenever lxml is installed.
+    """
+    if resolve_backend(backend) == "lxml":
+        return _parse_lxml(content, records)
+    return _parse_bs4(content, records)
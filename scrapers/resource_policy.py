@@ -0,0 +1,45 @@
+from urllib.parse import urlparse
+
+from config import BLOCK_RESOURCE_TYPES, BLOCK_DOMAINS
+
+
+class ResourcePolicy:
+    """
+    Decides which browser requests to abort.
+
+    Only the DOM is read, so images, media, fonts and third-party
+    trackers can be dropped without changing extracted text or the
+    src/href attributes. Navigation requests are never blocked.
+    """
+
+    def __init__(self, resource_types=None, domains=None):
+        self.resource_types = set(
+            BLOCK_RESOURCE_TYPES if resource_types is None else resource_types
+        )
+        self.domains = tuple(BLOCK_DOMAINS if domains is None else domains)
+        self.blocked = 0
+
+    @property
+    def enabled(self):
+        return bool(self.resource_types or self.domains)
+
+    def _blocked_host(self, url):
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == d or host.endswith("." + d) for d in self.domains)
+
+    def blocks(self, resource_type, url):
+        if resource_type == "document":
+            return False
+        return resource_type in self.resource_types or self._blocked_host(url)
+
+    def handle(self, route):
+        request = route.request
+        if self.blocks(request.resource_type, request.url):
+            self.blocked += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    def apply(self, context):
+        if self.enabled:
+            context.route("**/*", self.handle)
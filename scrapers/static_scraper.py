@@ -1,37 +1,36 @@
-import requests
-from bs4 import BeautifulSoup
+from core.fetch_engine import FetchEngine
+from core.http import http_get
+from core.utils import filter_fields
+from processing.parse_pool import get_parse_pool
+from scrapers.html_parser import parse_html
+
 
 def scrape_static(url, fields=None, preview=False):
-    r = requests.get(url, timeout=10)
-    r.encoding = "utf-8"
-    soup = BeautifulSoup(r.text, "lxml")
-
-    data = []
-    for tag in soup.find_all(["h1", "h2", "p", "a", "img", "li", "video", "source"]):
-        src = (
-            tag.get("src")
-            or tag.get("data-src")
-            or tag.get("data-lazy")
-            or tag.get("srcset")
-        )
-
-        data.append({
-            "tag": tag.name.lower(),
-            "text": tag.get_text(strip=True),
-            "href": tag.get("href"),
-            "src": src
-        })
+    r = http_get(url)
+    pool = get_parse_pool()
+    data, _ = pool.parse(r.content) if pool is not None else parse_html(r.content)
 
     if preview:
         return data[:10]
 
     # 🔒 DO NOT DROP tag/src EVER
-    if fields:
-        return [{
-            "tag": d.get("tag"),
-            "text": d.get("text") if "text" in fields else None,
-            "href": d.get("href"),
-            "src": d.get("src")
-        } for d in data]
-
-    return data
+    return filter_fields(data, fields)
+
+
+def scrape_static_many(urls, fields=None, concurrency=None, per_host=None):
+    """
+    Concurrent scrape_static() over many URLs.
+
+    Yields {"page_url", "page_data"} as pages complete (not in input
+    order); page_data is None when the fetch failed.
+    """
+    with FetchEngine(
+        lambda u: scrape_static(u, fields),
+        concurrency=concurrency,
+        per_host=per_host
+    ) as engine:
+        for url in urls:
+            engine.submit(url)
+
+        for url, data, _ in engine.results():
+            yield {"page_url": url, "page_data": data}
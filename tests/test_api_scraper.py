@@ -0,0 +1,71 @@
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+from scrapers import api_scraper
+from scrapers.api_scraper import clear_api_cache, iter_api_records
+
+PER_PAGE = 10
+TOTAL = 35
+
+
+def _response(url, status=200, body=None, headers=None):
+    r = requests.Response()
+    r.url = url
+    r.status_code = status
+    r._content = json.dumps(body).encode() if body is not None else b"<html></html>"
+    r.headers["Content-Type"] = "application/json" if body is not None else "text/html"
+    r.headers.update(headers or {})
+    return r
+
+
+class FakeWordPressAPI:
+    """/wp-json/posts?page=N with X-WP-TotalPages; every other URL is HTML."""
+
+    def __init__(self, fail_pages=()):
+        self.fail_pages = set(fail_pages)
+        self.requests = []
+
+    def __call__(self, url, **kwargs):
+        self.requests.append(url)
+        parts = urlsplit(url)
+        if parts.path != "/wp-json/posts":
+            return _response(url)
+
+        page = int(parse_qs(parts.query).get("page", ["1"])[0])
+        if page in self.fail_pages:
+            return _response(url, status=429, body={"error": "slow down"})
+        ids = range((page - 1) * PER_PAGE, min(page * PER_PAGE, TOTAL))
+        return _response(
+            url, body=[{"id": i} for i in ids],
+            headers={"X-WP-TotalPages": str(-(-TOTAL // PER_PAGE))}
+        )
+
+
+@pytest.fixture
+def api(monkeypatch):
+    clear_api_cache()
+    fake = FakeWordPressAPI()
+    monkeypatch.setattr(api_scraper, "http_get", fake)
+    monkeypatch.setattr(api_scraper, "COMMON_API_PATHS", ["/wp-json/posts"])
+    yield fake
+    clear_api_cache()
+
+
+def test_first_page_comes_from_discovery(api):
+    records = list(iter_api_records("http://x.com/"))
+
+    assert [r["id"] for r in records] == list(range(TOTAL))
+    assert api.requests.count("http://x.com/wp-json/posts") == 1
+
+
+def test_failed_page_ends_pagination_without_raising(api):
+    api.fail_pages = {3}
+
+    records = list(iter_api_records("http://x.com/"))
+
+    ids = [r["id"] for r in records]
+    assert ids[:2 * PER_PAGE] == list(range(2 * PER_PAGE))
+    assert not set(ids) & set(range(2 * PER_PAGE, 3 * PER_PAGE))
@@ -0,0 +1,125 @@
+from crawler.crawler import run_crawl
+from crawler.state_store import CrawlStateStore
+
+
+def _worker(pages):
+    """Crawl worker over `pages`: url -> (hrefs, final_url)."""
+    return lambda url: (None,) + pages[url] + (None,)
+
+
+def _crawl(pages, start_url, max_pages=10):
+    """Run the crawl loop over `pages`: url -> (hrefs, final_url)."""
+    fetched = []
+
+    def worker(url):
+        fetched.append(url)
+        hrefs, final_url = pages[url]
+        return None, hrefs, final_url, None
+
+    results = list(run_crawl(start_url, max_pages, worker, label="TEST", scrape=False,
+                             concurrency=1))
+    return fetched, results
+
+
+def test_start_url_is_fetched_as_given_and_links_resolve_against_it():
+    pages = {
+        "http://x.com/docs/": (["intro.html", "../about", "#top"], "http://x.com/docs/"),
+        "http://x.com/docs/intro.html": ([], "http://x.com/docs/intro.html"),
+        "http://x.com/about": ([], "http://x.com/about"),
+    }
+    fetched, results = _crawl(pages, "http://x.com/docs/")
+
+    assert fetched[0] == "http://x.com/docs/"
+    assert results[0]["links"] == [
+        "http://x.com/docs/intro.html",
+        "http://x.com/about",
+        "http://x.com/docs/#top",
+    ]
+    assert sorted(fetched) == sorted(pages)
+
+
+def test_links_resolve_against_final_url_after_redirect():
+    pages = {
+        "http://x.com/docs": (["intro.html"], "http://x.com/docs/"),
+        "http://x.com/docs/intro.html": (["../docs/"], "http://x.com/docs/intro.html"),
+    }
+    fetched, results = _crawl(pages, "http://x.com/docs")
+
+    assert results[0]["links"] == ["http://x.com/docs/intro.html"]
+    assert fetched == ["http://x.com/docs", "http://x.com/docs/intro.html"]
+
+
+def test_start_url_redirecting_to_www_keeps_following_links():
+    pages = {
+        "http://x.com/": (["/docs", "https://www.x.com/about"], "https://www.x.com/"),
+        "https://www.x.com/docs": (["http://other.com/"], "https://www.x.com/docs"),
+        "https://www.x.com/about": ([], "https://www.x.com/about"),
+    }
+    fetched, results = _crawl(pages, "http://x.com/")
+
+    assert results[0]["links"] == ["https://www.x.com/docs", "https://www.x.com/about"]
+    assert fetched == ["http://x.com/", "https://www.x.com/docs", "https://www.x.com/about"]
+
+
+def test_off_domain_links_are_not_followed():
+    pages = {
+        "http://x.com/": (["http://y.com/page", "/local"], "http://x.com/"),
+        "http://x.com/local": ([], "http://x.com/local"),
+    }
+    fetched, results = _crawl(pages, "http://x.com/")
+
+    assert results[0]["links"] == ["http://x.com/local"]
+    assert fetched == ["http://x.com/", "http://x.com/local"]
+
+
+def test_resume_counts_replayed_pages_toward_max_pages(tmp_path):
+    hrefs = [f"/{i}" for i in range(50)]
+    pages = {f"http://x.com/{i}": (hrefs, f"http://x.com/{i}") for i in range(50)}
+    path = str(tmp_path / "crawl.sqlite")
+
+    state = CrawlStateStore(path)
+    crawl = run_crawl("http://x.com/0", 20, _worker(pages), label="TEST",
+                      scrape=False, concurrency=1, state=state)
+    first = [next(crawl)["page_url"] for _ in range(15)]
+    crawl.close()
+    state.close()
+
+    fetched, results = [], []
+    state = CrawlStateStore(path)
+    try:
+        def worker(url):
+            fetched.append(url)
+            return _worker(pages)(url)
+
+        results = list(run_crawl("http://x.com/0", 20, worker, label="TEST",
+                                 scrape=False, concurrency=1, state=state))
+    finally:
+        state.close()
+
+    assert len(results) == 20
+    assert [p["page_url"] for p in results[:15]] == first
+    assert len(fetched) == 5
+
+
+def test_resume_remembers_redirected_start_host(tmp_path):
+    hrefs = [f"/{i}" for i in range(10)]
+    pages = {"http://x.com/": (hrefs, "https://www.x.com/")}
+    pages.update({f"https://www.x.com/{i}": (hrefs, f"https://www.x.com/{i}") for i in range(10)})
+    path = str(tmp_path / "crawl.sqlite")
+
+    state = CrawlStateStore(path)
+    crawl = run_crawl("http://x.com/", 8, _worker(pages), label="TEST",
+                      scrape=False, concurrency=1, state=state)
+    next(crawl), next(crawl)
+    crawl.close()
+    state.close()
+
+    state = CrawlStateStore(path)
+    try:
+        results = list(run_crawl("http://x.com/", 8, _worker(pages), label="TEST",
+                                 scrape=False, concurrency=1, state=state))
+    finally:
+        state.close()
+
+    assert len(results) == 8
+    assert results[-1]["links"]
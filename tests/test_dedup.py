@@ -0,0 +1,70 @@
+import random
+
+from core.records import PageRecords
+from processing.boilerplate import BoilerplateIndex
+from processing.dedup import NearDuplicateIndex, simhash, skip_near_duplicates
+from processing.pipeline import build_page
+
+_VOCAB = [f"word{i}" for i in range(400)]
+
+
+def _sentence(rng, n=12):
+    return " ".join(rng.choice(_VOCAB) for _ in range(n)).capitalize() + "."
+
+
+def _template_page(url, body, template):
+    records = PageRecords()
+    for text in template["nav"]:
+        records.append("a", text, "/", None)
+    for text in template["sidebar"] + body + template["footer"]:
+        records.append("p", text, None, None)
+    return {"page_url": url, "page_data": records}
+
+
+def _template(rng):
+    return {
+        "nav": ["Home", "Docs", "Blog", "About us", "Contact"],
+        # Long shared blocks: more text than the page body itself
+        "sidebar": [_sentence(rng, 20) for _ in range(6)],
+        "footer": ["Copyright 2024 Example Inc. All rights reserved.", "Privacy policy and terms"],
+    }
+
+
+def _run(pages, boilerplate):
+    index = NearDuplicateIndex(max_distance=6)
+    built = (build_page(p, boilerplate, enhance=False) for p in pages)
+    return [p["page_url"] for p in skip_near_duplicates(built, index, boilerplate)], index
+
+
+def test_simhash_needs_a_few_words():
+    assert simhash("too short") is None
+    assert simhash("three whole words") is not None
+
+
+def test_shared_template_does_not_make_pages_duplicates():
+    rng = random.Random(7)
+    template = _template(rng)
+    pages = [
+        _template_page(f"http://x.com/{i}", [_sentence(rng), _sentence(rng)], template)
+        for i in range(50)
+    ]
+
+    kept, index = _run(pages, BoilerplateIndex())
+
+    assert index.duplicates == 0
+    assert len(kept) == 50
+
+
+def test_same_body_under_the_template_is_a_duplicate():
+    rng = random.Random(3)
+    template = _template(rng)
+    body = [_sentence(rng) for _ in range(8)]
+    pages = [_template_page("http://x.com/a", body, template)] + [
+        _template_page(f"http://x.com/{i}", [_sentence(rng) for _ in range(8)], template)
+        for i in range(5)
+    ] + [_template_page("http://x.com/a?print=1", body, template)]
+
+    kept, index = _run(pages, BoilerplateIndex())
+
+    assert kept == [p["page_url"] for p in pages[:-1]]
+    assert index.duplicates == 1
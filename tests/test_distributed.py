@@ -0,0 +1,89 @@
+import threading
+import time
+
+from config import PER_HOST_CONCURRENCY
+from core.records import PageRecords
+from crawler import distributed
+from crawler.distributed import distributed_crawl
+from crawler.work_queue import InProcessQueue
+
+SITE = {
+    "http://x.com/": ["/a", "/private/b", "http://y.com/c"],
+    "http://x.com/a": ["/", "/sitemap-only"],
+    "http://x.com/seeded": [],
+}
+
+
+class FakeDiscovery:
+    crawl_delay = None
+    unchanged = ["http://x.com/sitemap-only"]
+
+    def __init__(self):
+        self.completed_urls = []
+
+    def allowed(self, url):
+        return "/private/" not in url
+
+    def seeds(self):
+        yield "http://x.com/seeded", -1
+
+    def completed(self, url):
+        self.completed_urls.append(url)
+
+
+def _fake_scrape(url, site_type, fields):
+    records = PageRecords()
+    records.append("p", f"Body of {url} with enough words to be kept as content text.", None, None)
+    return records, SITE[url], url
+
+
+def test_coordinator_applies_discovery(monkeypatch):
+    monkeypatch.setattr(distributed, "_scrape", _fake_scrape)
+    discovery = FakeDiscovery()
+
+    pages = list(distributed_crawl(
+        "http://x.com/", 10, "STATIC", shards=2, work_queue=InProcessQueue(2),
+        local=True, idle_timeout=5, discovery=discovery
+    ))
+
+    crawled = sorted(p["page_url"] for p in pages)
+    assert crawled == ["http://x.com/", "http://x.com/a", "http://x.com/seeded"]
+    assert sorted(discovery.completed_urls) == crawled
+
+
+def test_single_worker_keeps_several_pages_in_flight(monkeypatch):
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def slow_scrape(url, site_type, fields):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        hrefs = [f"/{i}" for i in range(20)] if url == "http://x.com/" else []
+        return PageRecords(), hrefs, url
+
+    monkeypatch.setattr(distributed, "_scrape", slow_scrape)
+
+    pages = list(distributed_crawl(
+        "http://x.com/", 12, "STATIC", shards=1, work_queue=InProcessQueue(1),
+        local=True, idle_timeout=5
+    ))
+
+    assert pages == []   # no records, nothing to export
+    assert peak[0] == PER_HOST_CONCURRENCY
+
+
+def test_workers_leave_llm_enhancement_to_the_coordinator(monkeypatch):
+    calls = []
+    monkeypatch.setattr(distributed, "_scrape", _fake_scrape)
+    monkeypatch.setattr(distributed, "build_page", lambda page, **kwargs: calls.append(kwargs) or page)
+
+    list(distributed_crawl(
+        "http://x.com/", 1, "STATIC", shards=1, work_queue=InProcessQueue(1),
+        local=True, idle_timeout=5
+    ))
+
+    assert calls == [{"enhance": False}]
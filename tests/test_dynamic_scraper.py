@@ -0,0 +1,43 @@
+from playwright.sync_api import Error as PlaywrightError
+
+from scrapers.dynamic_scraper import SCROLL_AND_PROBE_JS, _settle_adaptive
+
+
+class FakePage:
+    """Navigates away (destroying the context) on the first poll, then sits still."""
+
+    url = "http://x.com/"
+
+    def __init__(self):
+        self.polls = 0
+        self.loads = 0
+
+    def on(self, event, handler):
+        pass
+
+    def remove_listener(self, event, handler):
+        pass
+
+    def wait_for_load_state(self, state):
+        self.loads += 1
+
+    def wait_for_timeout(self, ms):
+        pass
+
+    def evaluate(self, script):
+        if script != SCROLL_AND_PROBE_JS:
+            return None
+        self.polls += 1
+        if self.polls == 1:
+            raise PlaywrightError("Execution context was destroyed, most likely because of a navigation")
+        return {"height": 1000, "quietMs": 10_000}
+
+
+def test_settle_survives_script_navigation():
+    page = FakePage()
+
+    _settle_adaptive(page, quiet_ms=1, max_ms=5000, poll_ms=1)
+
+    assert page.loads == 2
+    assert page.polls >= 3
+
@@ -0,0 +1,53 @@
+import pytest
+import requests
+
+from core import fetch_policy
+from core.fetch_policy import CircuitOpenError, FetchPolicy
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(fetch_policy, "backoff_delay", lambda attempt: 0)
+
+
+def _dead_host():
+    attempts = []
+
+    def send():
+        attempts.append(1)
+        raise requests.ConnectionError("refused")
+    return send, attempts
+
+
+def test_every_failed_attempt_counts_toward_the_breaker():
+    policy = FetchPolicy(retries=2, hedge=False)
+    policy.health("http://dead.test/").threshold = 5
+    send, attempts = _dead_host()
+
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            policy.execute("http://dead.test/", send)
+    with pytest.raises(CircuitOpenError):
+        policy.execute("http://dead.test/", send)
+
+    # 3 attempts, then 2 more until the circuit opened mid-request
+    assert len(attempts) == 5
+
+
+def test_success_resets_consecutive_failures():
+    policy = FetchPolicy(retries=2, hedge=False)
+    outcomes = iter([requests.ConnectionError("reset"), requests.ConnectionError("reset")])
+
+    class Response:
+        status_code = 200
+
+    def send():
+        error = next(outcomes, None)
+        if error is not None:
+            raise error
+        return Response()
+
+    assert policy.execute("http://flaky.test/", send).status_code == 200
+    health = policy.health("http://flaky.test/")
+    assert health.consecutive_failures == 0
+    assert health.snapshot()["retries"] == 2
@@ -0,0 +1,34 @@
+from crawler.frontier import Frontier, canonicalize_url
+
+
+def test_canonicalize_lowercases_scheme_and_host_and_drops_default_port():
+    assert canonicalize_url("HTTP://Example.COM:80/Path") == "http://example.com/Path"
+    assert canonicalize_url("https://example.com:8443/") == "https://example.com:8443/"
+
+
+def test_canonicalize_strips_fragment_tracking_params_and_sorts_query():
+    url = "http://x.com/a?b=2&utm_source=feed&a=1&fbclid=abc#top"
+    assert canonicalize_url(url) == "http://x.com/a?a=1&b=2"
+
+
+def test_canonicalize_trailing_slash_except_root():
+    assert canonicalize_url("http://x.com/docs/") == "http://x.com/docs"
+    assert canonicalize_url("http://x.com") == "http://x.com/"
+    assert canonicalize_url("http://x.com/") == "http://x.com/"
+
+
+def test_push_queues_original_url_but_dedupes_on_canonical_form():
+    frontier = Frontier()
+    assert frontier.push("http://x.com/docs/#intro") == "http://x.com/docs/"
+    assert frontier.push("http://X.com/docs") is None
+    assert frontier.pop() == ("http://x.com/docs/", 0)
+    assert not frontier
+
+
+def test_restore_and_mark_seen_use_canonical_key():
+    frontier = Frontier()
+    frontier.restore("http://x.com/a/", 1, 0)
+    frontier.mark_seen("http://x.com/b/?utm_medium=x")
+    assert frontier.push("http://x.com/a") is None
+    assert frontier.push("http://x.com/b") is None
+    assert frontier.pop() == ("http://x.com/a/", 1)
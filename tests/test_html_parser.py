@@ -0,0 +1,34 @@
+import pytest
+
+from scrapers import html_parser
+from scrapers.html_parser import parse_html
+
+PAGE = b"""<html><body>
+<h1>Title</h1>
+<p>Some <b>bold</b> text</p>
+<a href="/next">Next page</a>
+<img src="/a.png">
+</body></html>"""
+
+
+@pytest.mark.parametrize("backend", ["lxml", "bs4"])
+def test_backends_agree(backend, monkeypatch):
+    monkeypatch.setattr(html_parser, "PARSER_BACKEND", backend)
+    data, hrefs = parse_html(PAGE)
+
+    assert hrefs == ["/next"]
+    assert [(r["tag"], r["text"]) for r in data] == [
+        ("h1", "Title"), ("p", "Someboldtext"),
+        ("a", "Next page"), ("img", ""),
+    ]
+
+
+def test_bs4_fallback_works_without_lxml(monkeypatch):
+    monkeypatch.setattr(html_parser, "LXML_AVAILABLE", False)
+    monkeypatch.setattr(html_parser, "BS4_FEATURES", "html.parser")
+    monkeypatch.setattr(html_parser, "PARSER_BACKEND", "lxml")
+
+    data, hrefs = parse_html(PAGE)
+
+    assert hrefs == ["/next"]
+    assert data[0]["text"] == "Title"
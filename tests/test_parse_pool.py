@@ -0,0 +1,53 @@
+import pytest
+
+from processing import pipeline
+from processing.boilerplate import BoilerplateIndex
+from processing.parse_pool import ParsePool
+from scrapers.html_parser import parse_html
+
+TEMPLATE = "<p>Shared site navigation block that shows up on every single page here.</p>"
+
+
+def _html(i):
+    return (
+        f"<html><body>{TEMPLATE}<h1>Page {i}</h1>"
+        f"<p>Body paragraph number {i} carries the text that is unique to this page.</p>"
+        f'<a href="/p{i + 1}">Next page link</a><img src="/img{i}.png"></body></html>'
+    ).encode()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ParsePool(processes=1)
+    yield pool
+    pool.close()
+
+
+def test_parse_and_build_matches_in_process_build(pool):
+    data, hrefs, page = pool.parse_and_build(_html(1), "http://x.com/p1")
+
+    expected_data, expected_hrefs = parse_html(_html(1))
+    assert hrefs == expected_hrefs
+    assert data.to_columns() == expected_data.to_columns()
+    assert page == pipeline.build_page(
+        {"page_url": "http://x.com/p1", "page_data": expected_data}, enhance=False
+    )
+
+
+def test_extract_pages_uses_pool_with_boilerplate(pool, monkeypatch):
+    pages = []
+    for i in range(6):
+        data, _, extracted = pool.parse_and_build(_html(i), f"http://x.com/p{i}")
+        pages.append({"page_url": f"http://x.com/p{i}", "page_data": data, "extracted": extracted})
+
+    in_process = list(pipeline.extract_pages(
+        [{"page_url": p["page_url"], "page_data": p["page_data"]} for p in pages],
+        boilerplate=BoilerplateIndex()
+    ))
+
+    monkeypatch.setattr(pipeline, "get_parse_pool", lambda: pool)
+    monkeypatch.setattr(pool, "build_page", lambda page: pytest.fail("page rebuilt"))
+    pooled = list(pipeline.extract_pages(pages, boilerplate=BoilerplateIndex()))
+
+    assert pooled == in_process
+    assert "Shared site navigation" not in pooled[-1]["content"]["text"]
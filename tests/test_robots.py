@@ -0,0 +1,50 @@
+import pytest
+
+from crawler import robots
+from crawler.robots import RobotsRules, parse_crawl_delay
+
+ROBOTS = """
+User-agent: *
+Disallow: /private/
+
+User-agent: universal_scraper
+Crawl-delay: 2
+Disallow: /
+"""
+
+
+def test_own_group_applies_to_rules_and_crawl_delay():
+    rules = RobotsRules("http://x.com/robots.txt", ROBOTS)
+
+    assert not rules.allowed("http://x.com/page")
+    assert rules.crawl_delay == 2.0
+
+
+def test_other_agents_fall_back_to_star_group():
+    rules = RobotsRules("http://x.com/robots.txt", ROBOTS, user_agent="otherbot")
+
+    assert rules.allowed("http://x.com/page")
+    assert not rules.allowed("http://x.com/private/page")
+    assert rules.crawl_delay == 0.0
+
+
+def test_fractional_crawl_delay():
+    assert parse_crawl_delay("User-agent: *\nCrawl-delay: 0.5\n", "universal_scraper") == 0.5
+
+
+def test_disallow_all_and_missing_file():
+    assert not RobotsRules("http://x.com/robots.txt", disallow_all=True).allowed("http://x.com/")
+    assert RobotsRules("http://x.com/robots.txt").allowed("http://x.com/")
+
+
+class _Response:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+@pytest.mark.parametrize("status, allowed", [(404, True), (403, False), (500, False), (503, False)])
+def test_fetch_status_handling(monkeypatch, status, allowed):
+    monkeypatch.setattr(robots, "http_get", lambda url: _Response(status))
+
+    assert RobotsRules.fetch("http://x.com/").allowed("http://x.com/page") is allowed